@@ -0,0 +1,92 @@
+"""Animation scheduling module."""
+
+
+class Animation:
+    """
+    Playback state of one animated thing (the board, a grind spark, a UI element...).
+    Frames can be anything, the owner decides what to draw with get_frame().
+    """
+    def __init__(self, frames, frame_duration, loop=False, speed=1.0, on_finish=None):
+        """
+        Args:
+            frames (list): Frames in playback order
+            frame_duration (float): Milliseconds per frame at speed 1
+            loop (bool): Start over after the last frame instead of finishing
+            speed (float): Playback speed multiplier (0.5 = half speed)
+            on_finish (callable): Called with the animation when a non-looping one ends
+        """
+        self.frames = frames
+        self.frame_duration = frame_duration
+        self.loop = loop
+        self.speed = speed
+        self.on_finish = on_finish
+
+        self.frame = 0
+        self.elapsed = 0.0  # Milliseconds spent on the current frame
+        self.finished = False
+
+    def get_frame(self):
+        return self.frames[self.frame]
+
+    def advance(self, dt):
+        """
+        Move forward by dt milliseconds, stepping over as many frames as fit
+        (so a stall doesn't slow the animation down).
+
+        Returns:
+            True once a non-looping animation has played its last frame
+        """
+        duration = self.frame_duration / self.speed
+        self.elapsed += dt
+        if self.elapsed < duration:
+            return False
+
+        steps = int(self.elapsed // duration)
+        self.elapsed -= steps * duration
+        if self.loop:
+            self.frame = (self.frame + steps) % len(self.frames)
+        elif self.frame + steps < len(self.frames):
+            self.frame += steps
+        else:
+            self.frame = len(self.frames) - 1
+            self.finished = True
+        return self.finished
+
+
+class AnimationScheduler:
+    """
+    Owns every running animation and advances them all together from one time step.
+    """
+    def __init__(self):
+        self.animations = []
+
+    def play(self, frames, frame_duration, loop=False, speed=1.0, on_finish=None):
+        """Start a new animation and return it (keep it to draw or stop it)"""
+        animation = Animation(frames, frame_duration, loop, speed, on_finish)
+        self.animations.append(animation)
+        return animation
+
+    def stop(self, animation):
+        """Remove an animation without calling its on_finish"""
+        if animation in self.animations:
+            self.animations.remove(animation)
+
+    def update(self, dt):
+        """
+        Advance every animation by dt milliseconds. Finished ones are removed,
+        then their on_finish callbacks run.
+        """
+        finished = [animation for animation in self.animations if animation.advance(dt)]
+        if not finished:
+            return
+
+        self.animations = [animation for animation in self.animations if not animation.finished]
+        for animation in finished:
+            if animation.on_finish is not None:
+                animation.on_finish(animation)
+
+    def clear(self):
+        self.animations = []
+
+    def __len__(self):
+        return len(self.animations)
@@ -0,0 +1,190 @@
+"""Asset loading module."""
+
+import os
+import pygame
+import atlas
+
+
+class Assets:
+    """
+    Loads every image once, converts it to the display format and keeps
+    pre-scaled copies so the rest of the game never touches pygame.image.load.
+    Surfaces are shared, callers must copy one before drawing onto it.
+    """
+    def __init__(self):
+        self.images = {}  # Dictionary: normalized path -> converted surface at original size
+        self.scaled = {}  # Dictionary: (normalized path, (width, height)) -> scaled surface
+        self.groups = {}  # Dictionary: group name -> set of cache keys loaded for that group
+        self.unpacked = set()  # Normalized paths kept out of the atlas (see load)
+
+        # Packed texture atlas loaded from disk (see load_atlas / build_atlas)
+        self.atlas = None
+        self.atlas_stale = False  # True once something had to be loaded that the atlas didn't have
+
+    def normalize_path(self, path):
+        """Make "./objects/Tile1.png" and "objects/Tile1.png" the same asset"""
+        return os.path.normpath(path)
+
+    def convert(self, surface):
+        """Convert to the display format (keeping alpha) once a display exists"""
+        if pygame.display.get_surface() is not None:
+            return surface.convert_alpha()
+        return surface
+
+    def load(self, path, group, scale=1, size=None, packed=True):
+        """
+        Return an image, loading and converting it on first use.
+
+        Args:
+            path (str): Image file path
+            group (str): Asset group used for the memory report (e.g. "tiles", "icons")
+            scale (float): Size multiplier, e.g. the camera zoom
+            size (tuple): Exact (width, height) to scale to, overrides scale
+            packed (bool): False keeps the image (and its scaled copies) out of the atlas,
+                for files that are already packed like the baked trick strips
+        """
+        path = self.normalize_path(path)
+        if not packed:
+            self.unpacked.add(path)
+        image = self.images.get(path)
+        if image is None:
+            image = self.get_from_atlas(path, path)
+            if image is None:
+                image = self.convert(pygame.image.load(path))
+            self.images[path] = image
+
+        if size is None:
+            size = (int(image.get_width() * scale), int(image.get_height() * scale))
+        size = (int(size[0]), int(size[1]))
+
+        if size == image.get_size():
+            self.groups.setdefault(group, set()).add((path, None))
+            return image
+
+        key = (path, size)
+        surface = self.scaled.get(key)
+        if surface is None:
+            surface = self.get_from_atlas(self.get_atlas_name(key), path)
+            if surface is None:
+                surface = pygame.transform.scale(image, size)
+            self.scaled[key] = surface
+        self.groups.setdefault(group, set()).add(key)
+        return surface
+
+    def decode(self, path, scale=1, convert=True):
+        """
+        Load and scale an image without caching it, for stores that manage their own memory.
+        Safe to call from a worker thread with convert=False (convert on the main thread later).
+        """
+        image = pygame.image.load(path)
+        size = (int(image.get_width() * scale), int(image.get_height() * scale))
+        if size != image.get_size():
+            image = pygame.transform.scale(image, size)
+        return self.convert(image) if convert else image
+
+    def load_folder(self, folder, group, scale=1, skip=()):
+        """
+        Load every .png in a folder, except the names listed in skip.
+
+        Returns:
+            Dictionary: file name without extension -> surface
+        """
+        surfaces = {}
+        for filename in sorted(os.listdir(folder)):
+            if filename.endswith(".png") and filename[:-4] not in skip:
+                surfaces[filename[:-4]] = self.load(os.path.join(folder, filename), group, scale)
+        return surfaces
+
+    def get_atlas_name(self, key):
+        path, size = key
+        return f"{path}@{size[0]}x{size[1]}"
+
+    def get_source_signature(self, path):
+        """File size and modification time, used to tell if an atlas entry is out of date"""
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def get_from_atlas(self, name, path):
+        """
+        Return a view of an atlas entry if the atlas has it and its source file hasn't changed.
+        Marks the atlas stale on a miss so it can be rebuilt.
+        """
+        if self.atlas is None:
+            return None
+        if path in self.unpacked:
+            # An older atlas may still hold it, rebuild so its pages are dropped
+            if name in self.atlas:
+                self.atlas_stale = True
+            return None
+        if name in self.atlas and self.atlas.metadata.get(name) == self.get_source_signature(path):
+            return self.atlas.get_surface(name)
+        self.atlas_stale = True
+        return None
+
+    def load_atlas(self, folder):
+        """
+        Use a previously saved atlas, so images it holds don't have to be decoded or scaled again.
+        """
+        self.atlas = atlas.Atlas(self.convert)
+        if not self.atlas.load(folder):
+            self.atlas_stale = True
+
+    def build_atlas(self, folder, page_size=2048):
+        """
+        Pack every loaded image (original and scaled) into an atlas, save it to disk
+        and serve the cached surfaces from it from now on.
+        """
+        images = {}
+        metadata = {}
+        for path, surface in self.images.items():
+            if path in self.unpacked:
+                continue
+            images[path] = surface
+            metadata[path] = self.get_source_signature(path)
+        for key, surface in self.scaled.items():
+            if key[0] in self.unpacked:
+                continue
+            name = self.get_atlas_name(key)
+            images[name] = surface
+            metadata[name] = self.get_source_signature(key[0])
+
+        self.atlas = atlas.Atlas(self.convert)
+        self.atlas.build(images, page_size, metadata)
+        self.atlas.save(folder)
+        self.atlas_stale = False
+
+        # Point the caches at the atlas so later loads share its pages
+        for path in self.images:
+            if path not in self.unpacked:
+                self.images[path] = self.atlas.get_surface(path)
+        for key in self.scaled:
+            if key[0] not in self.unpacked:
+                self.scaled[key] = self.atlas.get_surface(self.get_atlas_name(key))
+
+    def get_surface_bytes(self, surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def get_memory_usage(self):
+        """
+        Estimated pixel memory per group. An image used by several groups is counted in each.
+
+        Returns:
+            Dictionary: group name -> bytes
+        """
+        usage = {}
+        for group, keys in self.groups.items():
+            total = 0
+            for path, size in keys:
+                surface = self.images[path] if size is None else self.scaled[(path, size)]
+                total += self.get_surface_bytes(surface)
+            usage[group] = total
+        return usage
+
+    def report(self):
+        """Return the memory usage as printable lines"""
+        lines = []
+        if self.atlas is not None:
+            lines.append(f"atlas: {len(self.atlas)} entries on {len(self.atlas.pages)} pages")
+        for group, total in sorted(self.get_memory_usage().items()):
+            lines.append(f"{group}: {len(self.groups[group])} surfaces, {total / 1024:.1f} KB")
+        return lines
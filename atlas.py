@@ -0,0 +1,168 @@
+"""Texture atlas module."""
+
+import json
+import os
+import pygame
+
+
+class RectPacker:
+    """
+    Shelf packer: rects are placed left to right in rows ("shelves"), tallest first,
+    and a new page is started when a page is full.
+    """
+    def __init__(self, page_width, page_height, padding=0):
+        self.page_width = page_width
+        self.page_height = page_height
+        self.padding = padding
+
+    def pack(self, sizes):
+        """
+        Args:
+            sizes (dict): name -> (width, height)
+
+        Returns:
+            (placements, page_sizes) where placements is name -> (page, x, y)
+            and page_sizes lists the (width, height) actually used by each page
+        """
+        placements = {}
+        page_sizes = []
+        padding = self.padding
+
+        page = -1
+        shelf_x = shelf_y = shelf_height = 0
+        used_width = used_height = 0
+
+        order = sorted(sizes, key=lambda name: (sizes[name][1], sizes[name][0]), reverse=True)
+        for name in order:
+            width, height = sizes[name]
+
+            # Images bigger than a page get a page of their own, the current page keeps filling
+            if width > self.page_width or height > self.page_height:
+                placements[name] = (len(page_sizes), 0, 0)
+                page_sizes.append((width, height))
+                continue
+
+            if page != -1 and shelf_x + width > self.page_width:
+                # Start a new shelf below the current one
+                shelf_y += shelf_height + padding
+                shelf_x = shelf_height = 0
+            if page == -1 or shelf_y + height > self.page_height:
+                # Start a new page
+                page = len(page_sizes)
+                page_sizes.append((0, 0))
+                shelf_x = shelf_y = shelf_height = 0
+                used_width = used_height = 0
+
+            placements[name] = (page, shelf_x, shelf_y)
+            shelf_x += width + padding
+            shelf_height = max(shelf_height, height)
+            used_width = max(used_width, shelf_x - padding)
+            used_height = max(used_height, shelf_y + height)
+            page_sizes[page] = (used_width, used_height)
+
+        return placements, page_sizes
+
+
+class Atlas:
+    """
+    A few large page surfaces holding many images, with a name -> (page, rect) lookup.
+    Entries are handed out as get_surface() views that share the page's pixels.
+    """
+    MANIFEST_VERSION = 1
+
+    def __init__(self, convert=None):
+        """
+        Args:
+            convert: Function applied to every page once built or loaded (e.g. Assets.convert)
+        """
+        self.convert = convert or (lambda surface: surface)
+        self.pages = []  # List of page surfaces
+        self.entries = {}  # Dictionary: name -> (page index, pygame.Rect)
+        self.metadata = {}  # Dictionary: name -> anything JSON-serializable the owner wants to keep
+
+    def build(self, images, page_size=2048, metadata=None):
+        """
+        Pack images into pages.
+
+        Args:
+            images (dict): name -> surface
+            page_size (int): Maximum width and height of a page
+            metadata (dict): Optional name -> JSON data saved with each entry
+        """
+        packer = RectPacker(page_size, page_size)
+        placements, page_sizes = packer.pack({name: surface.get_size() for name, surface in images.items()})
+
+        self.pages = [pygame.Surface(size, pygame.SRCALPHA) for size in page_sizes]
+        self.entries = {}
+        for name, (page, x, y) in placements.items():
+            surface = images[name]
+            # Copy the pixels exactly (including alpha) instead of blending onto the empty page
+            self.pages[page].blit(surface, (x, y), special_flags=pygame.BLEND_RGBA_ADD)
+            self.entries[name] = (page, pygame.Rect(x, y, surface.get_width(), surface.get_height()))
+
+        self.pages = [self.convert(page) for page in self.pages]
+        self.metadata = dict(metadata or {})
+
+    def get_surface(self, name):
+        """Return a subsurface view of an entry (no pixel copy)"""
+        page, rect = self.entries[name]
+        return self.pages[page].subsurface(rect)
+
+    def save(self, folder):
+        """Write the pages as PNGs plus a JSON manifest so later launches can skip packing"""
+        os.makedirs(folder, exist_ok=True)
+        page_files = []
+        for index, page in enumerate(self.pages):
+            filename = f"page{index}.png"
+            pygame.image.save(page, os.path.join(folder, filename))
+            page_files.append(filename)
+
+        # Remove pages left over from an earlier atlas that had more of them
+        for filename in os.listdir(folder):
+            if filename.startswith("page") and filename.endswith(".png") and filename not in page_files:
+                os.remove(os.path.join(folder, filename))
+
+        manifest = {
+            "version": self.MANIFEST_VERSION,
+            "pages": page_files,
+            "entries": {
+                name: {"page": page, "rect": [rect.x, rect.y, rect.width, rect.height],
+                       "meta": self.metadata.get(name)}
+                for name, (page, rect) in self.entries.items()
+            },
+        }
+        with open(os.path.join(folder, "manifest.json"), "w") as file:
+            json.dump(manifest, file, indent=1)
+
+    def load(self, folder):
+        """
+        Load a saved atlas. Returns False (leaving the atlas empty) if there is none
+        or it was written by a different manifest version.
+        """
+        manifest_path = os.path.join(folder, "manifest.json")
+        if not os.path.exists(manifest_path):
+            return False
+
+        try:
+            with open(manifest_path) as file:
+                manifest = json.load(file)
+            if manifest.get("version") != self.MANIFEST_VERSION:
+                return False
+            pages = [self.convert(pygame.image.load(os.path.join(folder, filename)))
+                     for filename in manifest["pages"]]
+        except (OSError, ValueError, KeyError, pygame.error):
+            return False
+
+        self.pages = pages
+        self.entries = {}
+        self.metadata = {}
+        for name, entry in manifest["entries"].items():
+            self.entries[name] = (entry["page"], pygame.Rect(entry["rect"]))
+            self.metadata[name] = entry.get("meta")
+        return True
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __len__(self):
+        return len(self.entries)
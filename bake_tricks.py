@@ -0,0 +1,146 @@
+"""
+Offline trick baking command.
+
+Builds each trick's animation from the board rotation renders in
+board_rotation_frames/ (flip{angle}_shuv{angle}.png), picked by trick_compiler.py,
+scales the frames to the camera zoom and writes them as one strip per trick plus
+a manifest. Tricks whose definition and source frames haven't changed since the
+last bake are skipped. The manifest records each source frame's size and
+modification time, so the game can ignore a bake whose renders changed since.
+
+Usage:
+    python bake_tricks.py [--zoom 2] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pygame
+import config
+import trick_compiler
+
+MANIFEST_VERSION = 2
+
+
+def get_definition(trick_name, zoom):
+    """Everything that decides what a baked trick looks like, apart from the source pixels"""
+    return trick_compiler.get_trick_definitions()[trick_name] + [zoom]
+
+
+def hash_trick(definition, frame_paths):
+    """Content hash of a trick: its definition plus the bytes of every source frame"""
+    digest = hashlib.sha1(json.dumps(definition).encode())
+    for path in frame_paths:
+        digest.update(path.encode())
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def get_source_signatures(frame_paths):
+    """[path, size, modification time] of each source frame, cheap to check at startup"""
+    signatures = []
+    for path in frame_paths:
+        stat = os.stat(path)
+        signatures.append([path, stat.st_size, stat.st_mtime_ns])
+    return signatures
+
+
+def get_output_filename(trick_name):
+    return trick_name + ".png"
+
+
+def bake_trick(frame_paths, zoom):
+    """
+    Load the source frames, scale them by the zoom and lay them out in a horizontal strip.
+    """
+    frames = [pygame.image.load(path) for path in frame_paths]
+    frame_width, frame_height = frames[0].get_size()
+    scaled_size = (int(frame_width * zoom), int(frame_height * zoom))
+
+    strip = pygame.Surface((scaled_size[0] * len(frames), scaled_size[1]), pygame.SRCALPHA)
+    for index, frame in enumerate(frames):
+        # Same steps as the runtime path: copy onto a transparent frame, then scale
+        frame_surface = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
+        frame_surface.blit(frame, (0, 0))
+        strip.blit(pygame.transform.scale(frame_surface, scaled_size), (index * scaled_size[0], 0))
+    return strip, scaled_size
+
+
+def load_manifest(output_path):
+    """Return the saved manifest, or None if it is missing or unreadable"""
+    try:
+        with open(os.path.join(output_path, "manifest.json")) as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def bake(zoom=config.CAMERA_ZOOM, frames_path=config.BOARD_ROTATION_FRAMES_PATH,
+         output_path=config.BAKED_TRICKS_PATH, force=False):
+    """
+    Bake every trick defined in config.FLIP_CONTROLS, rebuilding only the ones that changed.
+
+    Returns:
+        List of trick names that were rebuilt
+    """
+    os.makedirs(output_path, exist_ok=True)
+    old_manifest = load_manifest(output_path) or {}
+    old_tricks = old_manifest.get("tricks", {})
+
+    tricks = {}
+    rebuilt = []
+    for trick_name, indices in trick_compiler.compile_tricks().items():
+        definition = get_definition(trick_name, zoom)
+        frame_paths = trick_compiler.get_frame_paths(indices, frames_path)
+        missing = [path for path in frame_paths if not os.path.exists(path)]
+        if missing:
+            print(f"Skipping {trick_name}: missing frames {missing}")
+            continue
+
+        content_hash = hash_trick(definition, frame_paths)
+        filename = get_output_filename(trick_name)
+        old = old_tricks.get(trick_name)
+        if (not force and old and old["hash"] == content_hash
+                and os.path.exists(os.path.join(output_path, filename))):
+            # Same content, but the files may have been touched since
+            tricks[trick_name] = dict(old, sources=get_source_signatures(frame_paths))
+            continue
+
+        strip, frame_size = bake_trick(frame_paths, zoom)
+        pygame.image.save(strip, os.path.join(output_path, filename))
+        tricks[trick_name] = {
+            "file": filename,
+            "frames": len(frame_paths),
+            "frame_size": list(frame_size),
+            "definition": definition,
+            "hash": content_hash,
+            "sources": get_source_signatures(frame_paths),
+        }
+        rebuilt.append(trick_name)
+
+    manifest = {"version": MANIFEST_VERSION, "zoom": zoom, "tricks": tricks}
+    with open(os.path.join(output_path, "manifest.json"), "w") as file:
+        json.dump(manifest, file, indent=1)
+    return rebuilt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake trick animations from the board rotation renders.")
+    parser.add_argument("--zoom", type=float, default=config.CAMERA_ZOOM, help="Scale to bake the frames at")
+    parser.add_argument("--frames", default=config.BOARD_ROTATION_FRAMES_PATH, help="Folder with the rotation renders")
+    parser.add_argument("--output", default=config.BAKED_TRICKS_PATH, help="Folder to write the baked tricks to")
+    parser.add_argument("--force", action="store_true", help="Rebuild every trick even if it is up to date")
+    args = parser.parse_args()
+
+    zoom = int(args.zoom) if args.zoom == int(args.zoom) else args.zoom
+    rebuilt = bake(zoom, args.frames, args.output, args.force)
+    print(f"Baked {len(rebuilt)} trick(s): {', '.join(rebuilt) if rebuilt else 'all up to date'}")
+
+
+if __name__ == "__main__":
+    main()
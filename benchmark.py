@@ -0,0 +1,252 @@
+"""
+Benchmark suite.
+
+Runs the real game classes headlessly through fixed scenarios (level scrolling at
+several zooms and chunk load distances, trick spam over every FLIP_CONTROLS entry,
+idle menu) and records throughput, frame time percentiles and peak memory as JSON.
+Results can be compared against a saved baseline, failing if any scenario got
+slower or bigger by more than the threshold.
+
+Each scenario runs in its own process so peak memory and caches don't carry over.
+The game advances exactly one simulation step per frame, so every run does the same work.
+
+Usage:
+    python benchmark.py [--frames 600] [--only scroll] [--save-baseline]
+    python benchmark.py --baseline cache/benchmark/baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import config
+
+RESULTS_VERSION = 1
+
+# Scenario name -> (kind, parameters)
+SCENARIOS = {}
+for _zoom in (1, 2, 3):
+    for _distance in (2, 3, 4):
+        SCENARIOS[f"scroll-zoom{_zoom}-distance{_distance}"] = ("scroll", {"zoom": _zoom, "load_distance": _distance})
+SCENARIOS["tricks"] = ("tricks", {"hold_frames": 12, "gap_frames": 4})
+SCENARIOS["menu"] = ("menu", {})
+
+# Metrics compared against the baseline, and whether a higher value is better
+COMPARED_METRICS = {
+    "fps": True,
+    "frame_p50": False,
+    "frame_p95": False,
+    "frame_p99": False,
+    "peak_rss_kb": False,
+}
+
+
+def get_peak_rss_kb():
+    """Peak resident memory of this process in KB, or None where the resource module is missing (Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def press(game, key):
+    game.control.handle_key_down(key, game.player_state)
+
+
+def release(game, key):
+    game.control.handle_key_up(key, game.player_state)
+
+
+def get_trick_script(game, hold_frames, gap_frames):
+    """
+    Returns a function called before every frame that performs each trick in
+    FLIP_CONTROLS in turn: press its keys (tapping twice where needed), hold, release.
+    """
+    tricks = list(config.FLIP_CONTROLS.values())
+    cycle = hold_frames + gap_frames
+
+    def script(frame):
+        keys = [(game.control.get_pygame_key_from_action(action), double)
+                for action, double in tricks[frame // cycle % len(tricks)]["keys"]]
+        if frame % cycle == 0:
+            for key, double in keys:
+                if double:
+                    press(game, key)
+                    release(game, key)
+                press(game, key)
+        elif frame % cycle == hold_frames:
+            for key, double in keys:
+                release(game, key)
+    return script
+
+
+def run_scenario(name, frames):
+    """
+    Play one scenario in this process.
+
+    Returns:
+        Dictionary of results (see StageTimer.get_report) plus "peak_rss_kb"
+    """
+    import main
+
+    kind, parameters = SCENARIOS[name]
+    game = main.Main(headless=True, present=False)
+    script = None
+
+    if kind == "scroll":
+        game.game_state = "playing"
+        if parameters["zoom"] != game.level.zoom:
+            game.display.set_zoom(parameters["zoom"])
+            game.level.set_zoom(parameters["zoom"])
+            game.control.load_animations()
+        game.level.chunk_load_distance = parameters["load_distance"]
+        game.level.update_chunks(blocking=True)
+    elif kind == "tricks":
+        game.game_state = "playing"
+        script = get_trick_script(game, parameters["hold_frames"], parameters["gap_frames"])
+
+    timer = game.stage_timer
+    timer.reset()
+    for frame in range(frames):
+        if script is not None:
+            script(frame)
+        game.update()
+        game.draw(1.0)
+        timer.end_frame()
+
+    result = timer.get_report()
+    result["peak_rss_kb"] = get_peak_rss_kb()
+    game.exit()
+    return result
+
+
+def run_isolated(name, frames, verbose=False):
+    """Run a scenario in a child process and return its results (or {"error": ...})"""
+    handle, result_path = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+    try:
+        command = [sys.executable, os.path.abspath(__file__), "--run-scenario", name,
+                   "--frames", str(frames), "--result-file", result_path]
+        output = None if verbose else subprocess.DEVNULL
+        process = subprocess.run(command, stdout=output, stderr=subprocess.PIPE, text=True)
+        if process.returncode != 0:
+            error = process.stderr.strip().splitlines()
+            return {"error": error[-1] if error else f"exit code {process.returncode}"}
+        with open(result_path) as file:
+            return json.load(file)
+    finally:
+        os.remove(result_path)
+
+
+def get_metrics(result):
+    """Flatten the numbers compared against the baseline"""
+    return {
+        "fps": result["fps"],
+        "frame_p50": result["frame"]["p50"],
+        "frame_p95": result["frame"]["p95"],
+        "frame_p99": result["frame"]["p99"],
+        "peak_rss_kb": result["peak_rss_kb"],
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns:
+        List of (scenario, metric, baseline value, new value) that got worse by more than threshold
+    """
+    regressions = []
+    for name, result in results["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if old is None or "error" in old or "error" in result:
+            continue
+        old_metrics = get_metrics(old)
+        new_metrics = get_metrics(result)
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            before, after = old_metrics[metric], new_metrics[metric]
+            if not before or after is None:
+                continue
+            change = (before - after) / before if higher_is_better else (after - before) / before
+            if change > threshold:
+                regressions.append((name, metric, before, after))
+    return regressions
+
+
+def load_results(path):
+    try:
+        with open(path) as file:
+            results = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if results.get("version") != RESULTS_VERSION:
+        return None
+    return results
+
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(results, file, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the performance benchmarks.")
+    parser.add_argument("--frames", type=int, default=config.BENCHMARK_FRAMES, help="Frames per scenario")
+    parser.add_argument("--only", default="", help="Only run scenarios whose name contains this text")
+    parser.add_argument("--output", default=config.BENCHMARK_RESULTS_PATH, help="Where to write the results")
+    parser.add_argument("--baseline", default=config.BENCHMARK_BASELINE_PATH, help="Results to compare against")
+    parser.add_argument("--threshold", type=float, default=config.BENCHMARK_REGRESSION_THRESHOLD,
+                        help="Allowed relative slowdown before a metric counts as a regression (0.1 = 10%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Also save the results as the new baseline")
+    parser.add_argument("--verbose", action="store_true", help="Show the game's output")
+    parser.add_argument("--run-scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        # Child process started by run_isolated
+        result = run_scenario(args.run_scenario, args.frames)
+        with open(args.result_file, "w") as file:
+            json.dump(result, file)
+        return 0
+
+    import pygame
+    results = {"version": RESULTS_VERSION, "frames": args.frames, "python": sys.version.split()[0],
+               "pygame": pygame.version.ver, "scenarios": {}}
+    for name in SCENARIOS:
+        if args.only not in name:
+            continue
+        result = run_isolated(name, args.frames, args.verbose)
+        results["scenarios"][name] = result
+        if "error" in result:
+            print(f"{name:<28} failed: {result['error']}")
+        else:
+            memory = f"{result['peak_rss_kb'] / 1024:.0f} MB" if result["peak_rss_kb"] else "n/a"
+            print(f"{name:<28} {result['fps']:>8.1f} FPS  p50 {result['frame']['p50']:.2f}  "
+                  f"p95 {result['frame']['p95']:.2f}  p99 {result['frame']['p99']:.2f} ms  peak {memory}")
+
+    save_results(results, args.output)
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}, run with --save-baseline to create one")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for name, metric, before, after in regressions:
+        print(f"REGRESSION {name} {metric}: {before:.3f} -> {after:.3f}")
+    if regressions:
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Chunk cache module."""
+
+import collections
+
+
+class ChunkCache:
+    """
+    Least-recently-used store for built chunks and their baked surfaces.
+    Pinned entries (the active chunk window) are never evicted, unpinned ones stay
+    around until the chunk count or estimated byte limit pushes them out, so
+    scrolling back over them revives them without rebuilding.
+    """
+    def __init__(self, max_chunks, max_bytes):
+        self.max_chunks = max_chunks
+        self.max_bytes = max_bytes
+
+        self.entries = collections.OrderedDict()  # chunk_key -> [chunk, baked, size_bytes], oldest first
+        self.pinned = set()
+        self.total_bytes = 0
+
+        # Counters for tuning the limits
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def estimate_bytes(self, chunk, baked):
+        """Rough memory used by a chunk's tile grid and baked surface"""
+        size = len(chunk.tiles) * chunk.tiles.itemsize
+        if baked is not None:
+            surface = baked[0]
+            size += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        return size
+
+    def get(self, chunk_key):
+        """
+        Return (chunk, baked) for a cached chunk and mark it as recently used, or None.
+        """
+        entry = self.entries.get(chunk_key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(chunk_key)
+        return entry[0], entry[1]
+
+    def put(self, chunk_key, chunk, baked=None, pinned=False):
+        """Store (or replace) a chunk as the most recently used entry"""
+        self.discard(chunk_key)
+
+        size = self.estimate_bytes(chunk, baked)
+        self.entries[chunk_key] = [chunk, baked, size]
+        self.total_bytes += size
+        if pinned:
+            self.pinned.add(chunk_key)
+        self.evict()
+
+    def pin(self, chunk_key):
+        if chunk_key in self.entries:
+            self.pinned.add(chunk_key)
+
+    def unpin(self, chunk_key):
+        """Allow a chunk to be evicted, e.g. once it leaves the active window"""
+        self.pinned.discard(chunk_key)
+        if chunk_key in self.entries:
+            self.entries.move_to_end(chunk_key)
+        self.evict()
+
+    def discard(self, chunk_key):
+        entry = self.entries.pop(chunk_key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+        self.pinned.discard(chunk_key)
+
+    def evict(self):
+        """Drop the least recently used unpinned chunks until both limits are met"""
+        if len(self.entries) <= self.max_chunks and self.total_bytes <= self.max_bytes:
+            return
+
+        for chunk_key in list(self.entries):
+            if len(self.entries) <= self.max_chunks and self.total_bytes <= self.max_bytes:
+                break
+            if chunk_key in self.pinned:
+                continue
+            self.discard(chunk_key)
+            self.evictions += 1
+
+    def drop_surfaces(self):
+        """Forget every baked surface but keep the tile grids (used when textures change)"""
+        for entry in self.entries.values():
+            if entry[1] is not None:
+                entry[1] = None
+                self.total_bytes -= entry[2]
+                entry[2] = self.estimate_bytes(entry[0], None)
+                self.total_bytes += entry[2]
+
+    def clear(self):
+        self.entries.clear()
+        self.pinned = set()
+        self.total_bytes = 0
+
+    def get_stats(self):
+        return {
+            "chunks": len(self.entries),
+            "pinned": len(self.pinned),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __contains__(self, chunk_key):
+        return chunk_key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
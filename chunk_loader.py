@@ -0,0 +1,100 @@
+"""Background chunk generation module."""
+
+import queue
+import threading
+import time
+
+
+class ChunkLoader:
+    """
+    Generates chunks on a worker thread so the render loop never waits on create_chunk.
+    The main loop requests chunks, and drains finished ones from a ready queue
+    within a per-frame time budget.
+    """
+    def __init__(self, create_chunk, bake_chunk=None):
+        """
+        Args:
+            create_chunk: Function (chunk_x, chunk_y) -> chunk, run on the worker thread
+            bake_chunk: Optional function chunk -> (surface, origin_x, origin_y), also run on the worker
+        """
+        self.create_chunk = create_chunk
+        self.bake_chunk = bake_chunk
+
+        self.requests = queue.PriorityQueue()  # (priority, sequence, chunk_key, generation)
+        self.ready = queue.Queue()  # (chunk_key, generation, chunk, baked)
+        self.pending = set()  # Chunk keys requested but not drained yet (changed on the main thread only)
+        self.sequence = 0
+
+        # Bumped by reset() so results built with old textures / zoom are thrown away
+        self.generation = 0
+
+        self.running = True
+        self.thread = threading.Thread(target=self.worker, name="ChunkLoader", daemon=True)
+        self.thread.start()
+
+    def worker(self):
+        while self.running:
+            priority, sequence, chunk_key, generation = self.requests.get()
+            if chunk_key is None:
+                # Stop signal
+                break
+            # Skip requests from before a reset, or that the main thread built itself meanwhile
+            if generation != self.generation or chunk_key not in self.pending:
+                continue
+
+            chunk = self.create_chunk(*chunk_key)
+            baked = self.bake_chunk(chunk) if self.bake_chunk else None
+            self.ready.put((chunk_key, generation, chunk, baked))
+
+    def request(self, chunk_key, priority=0):
+        """
+        Ask for a chunk to be generated. Lower priority values are built first.
+        Chunks already requested are ignored.
+        """
+        if chunk_key in self.pending:
+            return
+        self.pending.add(chunk_key)
+        self.sequence += 1
+        self.requests.put((priority, self.sequence, chunk_key, self.generation))
+
+    def cancel(self, chunk_key):
+        """Forget a request, e.g. because the chunk was needed right away and built on the main thread"""
+        self.pending.discard(chunk_key)
+
+    def drain(self, budget_ms):
+        """
+        Hand out finished chunks one at a time until the time budget is used up.
+        The clock is checked after the caller has handled each chunk, so the budget
+        covers integrating them too. At least one chunk is yielded if any is ready,
+        so loading always makes progress.
+
+        Yields:
+            (chunk_key, chunk, baked) tuples
+        """
+        deadline = time.perf_counter() + budget_ms / 1000
+        while True:
+            try:
+                chunk_key, generation, chunk, baked = self.ready.get_nowait()
+            except queue.Empty:
+                return
+
+            if generation != self.generation:
+                continue
+
+            self.pending.discard(chunk_key)
+            yield chunk_key, chunk, baked
+            if time.perf_counter() >= deadline:
+                return
+
+    def reset(self):
+        """
+        Forget every outstanding request, e.g. after the zoom or textures changed.
+        """
+        self.generation += 1
+        self.pending = set()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        self.requests.put((float("-inf"), 0, None, None))
@@ -4,6 +4,12 @@
 DEBUG_TEXT_VISIBLE = True
 DEBUG_PRINT_VISIBLE = False  # Set to True only when debugging - prints 60x/second
 
+# --- Logging (see debug.py) ---
+LOG_LEVEL = "debug" if DEBUG_PRINT_VISIBLE else "info"  # Lowest level logged: "debug", "info", "success", "warning", "error"
+LOG_PATH = "cache/logs/game.log"  # Rewritten each launch by a background thread ("" = no file)
+LOG_BUFFER_SIZE = 4096  # Lines waiting for the writer thread, the oldest are dropped if it falls behind
+LOG_FLUSH_INTERVAL = 0.5  # Seconds between writes (errors are written straight away)
+
 # --- Game State ---
 """loading, menu, playing"""
 GAME_STATE = "menu"
@@ -21,6 +27,42 @@ DISPLAY_WIDTH = 1200
 DISPLAY_HEIGHT = 675
 SCALE_FACTOR = 0.2
 FPS = 60
+RENDER_UNCAPPED = False  # Render as fast as possible instead of capping at FPS
+INPUT_POLL_INTERVAL = 0.001  # Seconds between input polls while waiting for the next frame
+
+# --- Headless mode (benchmarks and display-less machines, see main.py --headless) ---
+HEADLESS = False  # No window (SDL dummy video driver), uncapped, prints per-stage timings at exit
+HEADLESS_FRAMES = 0  # Stop after this many frames (0 = no limit)
+HEADLESS_DURATION = 0  # Stop after this many seconds (0 = no limit)
+HEADLESS_PRESENT = False  # Still call pygame.display.update (costs a copy to the dummy window)
+
+# --- Input recording (replay with main.py --replay FILE) ---
+RECORD_INPUT = False  # Record every run's key events to RECORDING_PATH
+RECORDING_PATH = "cache/recordings/"
+
+# --- Benchmarks (see benchmark.py) ---
+BENCHMARK_FRAMES = 600  # Frames per scenario
+BENCHMARK_RESULTS_PATH = "cache/benchmark/results.json"
+BENCHMARK_BASELINE_PATH = "cache/benchmark/baseline.json"  # Machine specific, so kept out of the repo
+BENCHMARK_REGRESSION_THRESHOLD = 0.10  # Relative slowdown (or memory growth) that fails the comparison
+
+# --- Profiler overlay (toggle with PROFILER_TOGGLE_KEY) ---
+PROFILER_ENABLED = False  # Start with the overlay on, otherwise timing spans cost almost nothing
+PROFILER_WINDOW = 240  # Samples kept per span for the rolling stats (4 seconds at 60 steps per second)
+PROFILER_OVERLAY_REFRESH = 15  # Frames between re-rendering the overlay text
+
+# --- Tracing (Chrome trace-event JSON, dumped at exit or with TRACE_DUMP_KEY) ---
+TRACE_ENABLED = False  # Record every profiler span plus trick and sound events
+TRACE_CAPACITY = 1 << 18  # Events kept (five 8-byte arrays, about 10.5 MB), older ones are overwritten
+TRACE_PATH = "cache/traces/"
+
+# --- Input latency (key press to the first presented frame of the trick, see latency.py) ---
+LATENCY_WINDOW = 240  # Latest samples per trick used for the overlay stats (histograms count the whole session)
+LATENCY_PATH = "cache/latency/"  # Per-trick stats and histograms are written here at exit
+
+# --- Simulation settings ---
+SIMULATION_RATE = 60  # Fixed simulation steps per second (camera, chunks, tricks), independent of FPS
+MAX_SIMULATION_STEPS = 5  # Most steps run in one frame to catch up after a stall
 
 # --- Texture settings ---
 FLOOR_TEXTURES_PATH = "./objects/"
@@ -29,6 +71,15 @@ FLOOR_TEXTURES_PATH = "./objects/"
 CAMERA_ZOOM = 2
 CAMERA_SPEED = 6
 
+# --- Level rendering ---
+LEVEL_RENDER_MODE = "full"  # "full" redraws every visible chunk, "scroll" shifts last frame and draws only the exposed edges
+BAKE_CHUNKS = True  # Pre-render each chunk into one surface (one blit per chunk instead of 64)
+CHUNK_LOADER_THREADED = True  # Generate chunks on a background thread instead of in the render loop
+CHUNK_PREFETCH_FRAMES = 120  # How many simulation steps ahead of the camera (at its current velocity) to prefetch
+CHUNK_LOAD_BUDGET_MS = 2  # Max time per frame spent adding finished chunks from the worker
+CHUNK_CACHE_MAX_CHUNKS = 48  # Chunks kept (loaded + recently unloaded) before LRU eviction
+CHUNK_CACHE_MAX_BYTES = 32 * 1024 * 1024  # Estimated memory limit for cached tiles + baked surfaces
+
 # --- Colors ---
 COLORS = {
     'primary': (52, 73, 94),
@@ -44,6 +95,11 @@ COLORS = {
 }
 
 ANIMATIONS = "animations/"
+GRINDS_PATH = "grinds/"
+
+# --- Texture atlas ---
+USE_TEXTURE_ATLAS = True  # Pack loaded images into a few large surfaces, saved to disk for later launches
+ATLAS_CACHE_PATH = "cache/atlas/"
 
 GRIND_TRICK_MAP = {
     "50-50": ["center"],
@@ -72,12 +128,30 @@ GRIND_TRICK_MAP = {
 ANIMATION_FRAME_RATE = 24
 TRICK_ANIMATION_DURATION = 0.15  # seconds
 LANDING_ANIMATION_DURATION = 0.3  # seconds
+PRELOAD_TRICK_FRAMES = True  # Build every trick's scaled frames at startup (otherwise on first use)
+
+# --- Trick baking (see bake_tricks.py) ---
+BOARD_ROTATION_FRAMES_PATH = "board_rotation_frames/"
+BOARD_REST_FRAME_PATH = "animations/Default.png"  # Stands in for the missing flip0_shuv0 render
+BAKED_TRICKS_PATH = "cache/tricks/"
+TRICK_FRAME_COUNT = 18  # Frames per trick when its definition doesn't say
+COMPILED_TRICKS_PATH = "cache/compiled_tricks.json"  # Frame sequences compiled by trick_compiler.py
+
+# Runtime board rotation frames (see rotation_frames.py)
+ROTATION_FRAME_CACHE_BYTES = 4 * 1024 * 1024  # Decoded renders kept in memory before the oldest are dropped
+ROTATION_FRAME_PREFETCH = False  # Decode the next angles on a background thread (started on first use)
 
 # --- Sound settings ---
+# Category -> file prefix, every numbered variant (Land_1.wav, Land_2.wav...) is used
 SOUND_PATHS = {
-    "land": "SFX/land_",
-    "pop": "SFX/pop_"
+    "land": "SFX/Land_",
+    "pop": "SFX/Pop_"
+}
+SOUND_VOICES = {  # Sounds of a category that can play at once (each gets its own reserved channels)
+    "land": 2,
+    "pop": 2
 }
+SOUND_PRELOAD = True  # Decode every sound at startup (otherwise on first play)
 
 SOUND_VOLUME = 0.6
 
@@ -106,46 +180,64 @@ KEY_MAPPINGS = {
     pygame.K_l: 'right-right',
 }
 
+PROFILER_TOGGLE_KEY = pygame.K_F3
+TRACE_DUMP_KEY = pygame.K_F4
+
 # --- Trick Controls ---
+# keys: [[action, needs double tap], ...] for the left and right hand
+# flip/shuv: total board rotation in degrees (360 = full flip, 180 = half shuv, negative = other direction)
+# frames: animation length, compiled from the board rotation renders by trick_compiler.py
 FLIP_CONTROLS = {
     # No double tap tricks
     "Kickflip": {
-        "keys": [["left-left", False], ["right-down", False]]
+        "keys": [["left-left", False], ["right-down", False]],
+        "flip": 360, "shuv": 0, "frames": 18
     },
     "Heelflip": {
-        "keys": [["left-left", False], ["right-up", False]]
+        "keys": [["left-left", False], ["right-up", False]],
+        "flip": -360, "shuv": 0, "frames": 18
     },
     "Varial Kickflip": {
-        "keys": [["left-down", False], ["right-down", False]]
+        "keys": [["left-down", False], ["right-down", False]],
+        "flip": 360, "shuv": 180, "frames": 18
     },
     "Varial Heelflip": {
-        "keys": [["left-up", False], ["right-up", False]]
+        "keys": [["left-up", False], ["right-up", False]],
+        "flip": 360, "shuv": -180, "frames": 18
     },
     "Hardflip": {
-        "keys": [["left-up", False], ["right-down", False]]
+        "keys": [["left-up", False], ["right-down", False]],
+        "flip": -360, "shuv": -180, "frames": 18
     },
     "Inward Heelflip": {
-        "keys": [["left-down", False], ["right-up", False]]
+        "keys": [["left-down", False], ["right-up", False]],
+        "flip": -360, "shuv": 180, "frames": 18
     },
     "BS-Shuv": {
-        "keys": [["left-down", False], ["right-left", False]]
+        "keys": [["left-down", False], ["right-left", False]],
+        "flip": 0, "shuv": 180, "frames": 18
     },
     "FS-Shuv": {
-        "keys": [["left-up", False], ["right-left", False]]
+        "keys": [["left-up", False], ["right-left", False]],
+        "flip": 0, "shuv": -180, "frames": 18
     },
     
     # Double tap tricks
     "360 Hardflip": {
-        "keys": [["left-up", True], ["right-down", False]]
+        "keys": [["left-up", True], ["right-down", False]],
+        "flip": 360, "shuv": -360, "frames": 18
     },
     "360 Inward Heelflip": {
-        "keys": [["left-down", True], ["right-up", False]]
+        "keys": [["left-down", True], ["right-up", False]],
+        "flip": -360, "shuv": 360, "frames": 18
     },
     "Tre Flip": {
-        "keys": [["left-down", True], ["right-down", False]]
+        "keys": [["left-down", True], ["right-down", False]],
+        "flip": 360, "shuv": 360, "frames": 18
     },
     "Lazer Flip": {
-        "keys": [["left-up", True], ["right-up", False]]
+        "keys": [["left-up", True], ["right-up", False]],
+        "flip": -360, "shuv": -360, "frames": 18
     }
 }
 
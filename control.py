@@ -1,10 +1,7 @@
 """Skateboard rendering / controls module."""
 
 import config
-import pygame
-import os
-import time
-import random
+import trick_compiler
 
 
 class Control:
@@ -14,7 +11,7 @@ class Control:
         self.main = main
 
         # Simple double-tap tracking
-        self.last_key = ["none", 0]  # [key, timestamp]
+        self.last_key = ["none", None]  # [key, simulation time in seconds] (see Main.get_time)
         self.double_tap_window = 0.3  # 300ms window
         self.is_double_tap = False
         
@@ -23,41 +20,58 @@ class Control:
         
         self.trigger_key_combo = [["none", False], ["none", False]]
         
+        # Lookup tables built from config.FLIP_CONTROLS and config.KEY_MAPPINGS
+        self.compile_controls()
+        
         self.load_animations()
         
     def load_animations(self):
         """
         Loads the animations for the tricks.
+        Frames are scaled for Display's zoom, so call this again after changing it.
         """
         
-        self.animations = {}
-        animations_path = config.ANIMATIONS
-        for filename in os.listdir(animations_path):
-            if filename.endswith(".png"):
-                full_path = os.path.join(animations_path, filename)
-                # Use trick name without extension as key
-                trick_name = filename[:-4]  # Remove .png extension
-                self.animations[trick_name] = pygame.image.load(full_path)
+        # Tricks baked by bake_tricks.py go straight into Display's frame cache
+        baked_tricks = self.main.display.load_baked_frames(config.BAKED_TRICKS_PATH)
+        
+        # Spritemaps are only needed for tricks without fresh baked frames
+        # They stay at their original size, Display scales the frames it slices out of them
+        # Keys are the trick names (file names without .png)
+        self.animations = self.main.assets.load_folder(config.ANIMATIONS, "trick sheets", skip=baked_tricks)
+        
+        # Tricks with neither (e.g. newly added to config) are built from the rotation renders
+        compiled_tricks = self.main.display.load_compiled_frames(
+            trick_compiler.compile_tricks(), skip=baked_tricks | set(self.animations))
+        
+        self.main.debug.debug("Loaded animations: %s, baked: %s, compiled: %s",
+                              list(self.animations.keys()), sorted(baked_tricks), sorted(compiled_tricks))
+        
+        # Grind sprites, pre-scaled to the board size
+        self.grind_sprites = self.main.assets.load_folder(config.GRINDS_PATH, "grinds", self.main.display.zoom)
         
-        print(f"Loaded animations: {list(self.animations.keys())}")
+        # Slice and scale every trick now instead of when the trick fires
+        if config.PRELOAD_TRICK_FRAMES:
+            self.main.display.preload_animation_frames(self.animations)
 
-    def handle_key_down(self, key, player_state):
+    def handle_key_down(self, key, player_state, event_time=None):
         """
         Handles the key press event by held down by the user and passes the action (if any) to the handle_control method.
+        event_time is when the key was pressed in simulation seconds (default: the current step).
         """
         if key in config.KEY_MAPPINGS:
             action = config.KEY_MAPPINGS[key]
-            current_time = time.time()
+            current_time = self.main.get_time() if event_time is None else event_time
             
             # Check for double-tap
             if (self.last_key[0] == key and 
-                self.last_key[1] != 0 and 
+                self.last_key[1] is not None and 
                 current_time - self.last_key[1] <= self.double_tap_window):
                 
                 # Double tap detected!
                 self.is_double_tap = True
                 self.double_tapped_actions.add(action)  # Remember this action was double-tapped
-                print(f"Double tap detected for key {key} ({action})")
+                if self.main.debug.debug_enabled:
+                    self.main.debug.debug("Double tap detected for key %s (%s)", key, action)
                 
                 # Set the appropriate key as held
                 if "left-" in action:
@@ -78,7 +92,8 @@ class Control:
                     self.keys_held[1] = [action, True]
                 
                 # Check for trick combos (including non-double-tap tricks)
-                print(f"Single tap: {action}, Current double-tapped: {self.double_tapped_actions}")
+                if self.main.debug.debug_enabled:
+                    self.main.debug.debug("Single tap: %s, Current double-tapped: %s", action, self.double_tapped_actions)
                 self.handle_control(self.keys_held, player_state, is_double_tap=False, key=key)
             
             # Update last key tracking
@@ -106,117 +121,91 @@ class Control:
     
     def update(self):
         # Reset double tap state after window expires
-        current_time = time.time()
-        if self.last_key[1] != 0 and current_time - self.last_key[1] > self.double_tap_window:
+        current_time = self.main.get_time()
+        if self.last_key[1] is not None and current_time - self.last_key[1] > self.double_tap_window:
             self.is_double_tap = False
         
         # Check if both keys are held and combination has changed
         if self.keys_held[0][0] != "none" and self.keys_held[1][0] != "none":
             if self.keys_held != self.previous_keys_held:
-                print(f"UPDATE: Both keys held - {self.keys_held[0][0]} + {self.keys_held[1][0]}, Double-tapped: {self.double_tapped_actions}")
+                if self.main.debug.debug_enabled:
+                    self.main.debug.debug("UPDATE: Both keys held - %s + %s, Double-tapped: %s",
+                                          self.keys_held[0][0], self.keys_held[1][0], self.double_tapped_actions)
                 self.handle_control(self.keys_held, self.main.player_state)
             
         self.previous_keys_held = self.keys_held.copy()
     
+    def compile_controls(self):
+        """
+        Build the lookup tables used on every key event. Call again after changing
+        config.KEY_MAPPINGS or config.FLIP_CONTROLS (remap_key does it for you).
+        
+        trick_table maps (left action, right action, left double-tapped, right double-tapped)
+        to the trick it triggers. Double-tap tricks are entered first so they win over a
+        regular trick on the same keys, and earlier tricks in the config win over later ones.
+        """
+        self.trick_table = {}
+        double_tap_tricks = []
+        regular_tricks = []
+        for trick_name, config_data in config.FLIP_CONTROLS.items():
+            (left_required, left_needs_double), (right_required, right_needs_double) = config_data["keys"]
+            if left_needs_double or right_needs_double:
+                double_tap_tricks.append((trick_name, left_required, left_needs_double, right_required, right_needs_double))
+            else:
+                regular_tricks.append((trick_name, left_required, left_needs_double, right_required, right_needs_double))
+        
+        for trick_name, left_required, left_needs_double, right_required, right_needs_double in double_tap_tricks + regular_tricks:
+            # A trick fires in every double-tap state that covers what it needs
+            for left_double in (False, True):
+                for right_double in (False, True):
+                    if (left_double or not left_needs_double) and (right_double or not right_needs_double):
+                        self.trick_table.setdefault((left_required, right_required, left_double, right_double), trick_name)
+        
+        # Inverse of config.KEY_MAPPINGS (the first key mapped to an action wins)
+        self.action_keys = {}
+        for pygame_key, action_string in config.KEY_MAPPINGS.items():
+            self.action_keys.setdefault(action_string, pygame_key)
+    
+    def remap_key(self, key, action):
+        """
+        Bind a pygame key to an action (or unbind it with action=None) and rebuild the lookup tables.
+        """
+        if action is None:
+            config.KEY_MAPPINGS.pop(key, None)
+        else:
+            config.KEY_MAPPINGS[key] = action
+        self.compile_controls()
+    
     def get_pygame_key_from_action(self, action):
         """
         Helper method to get pygame key from action string.
         """
-        for pygame_key, action_string in config.KEY_MAPPINGS.items():
-            if action_string == action:
-                return pygame_key
-        return None
+        return self.action_keys.get(action)
     
     def handle_trick_combo(self, keys_held, is_double_tap=False, key=None):
         """
         Handles the key combo for the game based on the action.
         Triggers tricks when specific key combinations are held.
         """
-        left_key = keys_held[0][0] if keys_held[0][0] != "none" else "none"
-        right_key = keys_held[1][0] if keys_held[1][0] != "none" else "none"
-        
-        # Get the action string for the double-tapped key
-        double_tapped_action = config.KEY_MAPPINGS.get(key, None) if is_double_tap else None
-        
-        # Check each trick configuration
-        # First pass: Check double-tap tricks (prioritize them)
-        double_tap_tricks = []
-        regular_tricks = []
+        profiler = self.main.profiler
+        start = profiler.begin() if profiler.enabled else None
         
-        for trick_name, config_data in config.FLIP_CONTROLS.items():
-            required_keys = config_data["keys"]
-            left_needs_double = required_keys[0][1]
-            right_needs_double = required_keys[1][1]
-            
-            # Categorize tricks
-            if left_needs_double or right_needs_double:
-                double_tap_tricks.append((trick_name, config_data))
-            else:
-                regular_tricks.append((trick_name, config_data))
+        left_key = keys_held[0][0]
+        right_key = keys_held[1][0]
         
-        print(f"Checking tricks for combo: {left_key} + {right_key}")
-        print(f"Double-tap tricks to check: {[name for name, _ in double_tap_tricks]}")
-        print(f"Regular tricks to check: {[name for name, _ in regular_tricks]}")
+        # Double-tap priority is already resolved in the table, so this is a single lookup
+        trick_name = self.trick_table.get((left_key, right_key,
+                                           left_key in self.double_tapped_actions,
+                                           right_key in self.double_tapped_actions))
+        if trick_name is not None:
+            if self.main.debug.debug_enabled:
+                self.main.debug.debug("TRICK TRIGGERED: %s (key combo: %s + %s, double-tapped actions: %s)",
+                                      trick_name, left_key, right_key, self.double_tapped_actions)
+            self.trigger_key_combo = [left_key, right_key]
+            self.execute_trick(trick_name)
         
-        # Check double-tap tricks first
-        for trick_name, config_data in double_tap_tricks:
-            required_keys = config_data["keys"]
-            
-            # Extract key names and double-tap requirements
-            left_required = required_keys[0][0]  # Key name
-            left_needs_double = required_keys[0][1]  # Boolean
-            right_required = required_keys[1][0]  # Key name  
-            right_needs_double = required_keys[1][1]  # Boolean
-            
-            # Check if current key combination matches this trick
-            if left_key == left_required and right_key == right_required:
-                # Check double-tap requirements using persistent tracking
-                left_double_ok = not left_needs_double or (left_required in self.double_tapped_actions)
-                right_double_ok = not right_needs_double or (right_required in self.double_tapped_actions)
-                
-                if left_double_ok and right_double_ok:
-                    print(f"✅ DOUBLE-TAP TRICK TRIGGERED: {trick_name}")
-                    print(f"   Key combo: {left_key}{' (double)' if left_needs_double else ''} + {right_key}{' (double)' if right_needs_double else ''}")
-                    print(f"   Double-tapped actions: {self.double_tapped_actions}")
-                    self.trigger_key_combo = [left_key, right_key]
-                    self.execute_trick(trick_name)
-                    return
-                else:
-                    print(f"❌ Double-tap trick {trick_name} failed:")
-                    print(f"   Required: {left_required}{' (double)' if left_needs_double else ''} + {right_required}{' (double)' if right_needs_double else ''}")
-                    print(f"   Current: {left_key}{' (double)' if left_needs_double else ''} + {right_key}{' (double)' if right_needs_double else ''}")
-                    print(f"   Left OK: {left_double_ok}, Right OK: {right_double_ok}")
-                    print(f"   Double-tapped actions: {self.double_tapped_actions}")
-        
-        # Then check regular tricks
-        for trick_name, config_data in regular_tricks:
-            required_keys = config_data["keys"]
-            
-            # Extract key names and double-tap requirements
-            left_required = required_keys[0][0]  # Key name
-            left_needs_double = required_keys[0][1]  # Boolean
-            right_required = required_keys[1][0]  # Key name  
-            right_needs_double = required_keys[1][1]  # Boolean
-            
-            # Check if current key combination matches this trick
-            if left_key == left_required and right_key == right_required:
-                # Check double-tap requirements using persistent tracking
-                left_double_ok = not left_needs_double or (left_required in self.double_tapped_actions)
-                right_double_ok = not right_needs_double or (right_required in self.double_tapped_actions)
-                
-                if left_double_ok and right_double_ok:
-                    print(f"✅ REGULAR TRICK TRIGGERED: {trick_name}")
-                    print(f"   Key combo: {left_key}{' (double)' if left_needs_double else ''} + {right_key}{' (double)' if right_needs_double else ''}")
-                    print(f"   Double-tapped actions: {self.double_tapped_actions}")
-                    self.trigger_key_combo = [left_key, right_key]
-                    self.execute_trick(trick_name)
-                    return
-                else:
-                    print(f"❌ Regular trick {trick_name} failed:")
-                    print(f"   Required: {left_required}{' (double)' if left_needs_double else ''} + {right_required}{' (double)' if right_needs_double else ''}")
-                    print(f"   Current: {left_key}{' (double)' if left_needs_double else ''} + {right_key}{' (double)' if right_needs_double else ''}")
-                    print(f"   Left OK: {left_double_ok}, Right OK: {right_double_ok}")
-                    print(f"   Double-tapped actions: {self.double_tapped_actions}")
+        if start is not None:
+            profiler.end("control.trick_combo", start)
     
     def handle_trick_combo_end(self, keys_held, key=None):
         """
@@ -229,38 +218,52 @@ class Control:
                 self.trigger_key_combo = ["none", "none"]
                 self.main.player_state = "rolling"
                 self.main.display.stop_animation()
-                pygame.mixer.Sound(config.SOUND_PATHS["land"] + str(random.randint(1, 5)) + ".wav").play()
-                self.main.debug.info(f"Trick combo ended with key {key}")
+                self.play_sound("land")
+                self.main.debug.info("Trick combo ended with key %s", key)
         elif keys_held[0][0] == "none" and keys_held[1][0] == "none":
             # Both keys released
             self.trigger_key_combo = ["none", "none"]
             self.main.player_state = "rolling"
             self.main.display.stop_animation()
-            pygame.mixer.Sound(config.SOUND_PATHS["land"] + str(random.randint(1, 5)) + ".wav").play()
+            self.play_sound("land")
             self.main.debug.info("Trick combo ended - both keys released")
     
+    def play_sound(self, category):
+        """
+        Play a sound effect from the preloaded sound bank (see config.SOUND_PATHS).
+        """
+        profiler = self.main.profiler
+        start = profiler.begin() if profiler.enabled else None
+        path = self.main.sounds.play(category)
+        if start is not None:
+            profiler.end("control.play_sound", start, path)
+    
     def execute_trick(self, trick_name):
         """
         Executes the specified trick.
         """
         self.main.player_state = "airborne"
+        if self.main.profiler.enabled:
+            self.main.profiler.instant("trick", trick_name)
 
-        # Get the animation sprite for this trick
-        if trick_name not in self.animations:
-            print(f"❌ ERROR: Animation not found for trick '{trick_name}'")
-            print(f"Available animations: {list(self.animations.keys())}")
+        # Get the animation sprite for this trick (baked tricks have no sprite, only cached frames)
+        if trick_name not in self.animations and not self.main.display.has_animation_frames(trick_name):
+            self.main.debug.error("Animation not found for trick '%s' (available: %s)",
+                                  trick_name, list(self.animations.keys()))
             return
         
-        animation = self.animations[trick_name]
+        animation = self.animations.get(trick_name)
         
         # Start the animation with looping enabled (will loop while keys are held)
-        self.main.display.start_animation(trick_name, animation, loop=True)
+        if self.main.display.start_animation(trick_name, animation, loop=True):
+            # Timed until the first frame of it is presented
+            self.main.latency.begin(trick_name)
 
-        # Play a random SFX/pop_(1-6).wav
-        random_sfx = random.randint(1, 6)
-        pygame.mixer.Sound(config.SOUND_PATHS["pop"] + str(random_sfx) + ".wav").play()
+        # Play the next pop variant
+        self.play_sound("pop")
         
-        print(f"Executing trick: {trick_name}")
+        if self.main.debug.debug_enabled:
+            self.main.debug.debug("Executing trick: %s", trick_name)
         
         # Add your trick execution logic here
         # For example:
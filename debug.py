@@ -1,14 +1,136 @@
+"""Debug/logging module."""
+
+import collections
+import os
+import sys
+import threading
+import time
 import config
 import pygame
 
+# Log levels, lowest to highest
+DEBUG = 10
+INFO = 20
+SUCCESS = 25
+WARNING = 30
+ERROR = 40
+
+LEVELS = {"debug": DEBUG, "info": INFO, "success": SUCCESS, "warning": WARNING, "error": ERROR}
+LEVEL_NAMES = {DEBUG: "Debug", INFO: "Info", SUCCESS: "Success", WARNING: "Warning", ERROR: "Error"}
+
 
 class Debug:
-    def __init__(self, main):
+    """
+    Leveled logger plus the on-screen debug message.
+    
+    Logging never touches stdout or the disk on the calling thread: lines go into a
+    bounded ring buffer that a background thread writes to config.LOG_PATH (and to
+    stdout when config.DEBUG_PRINT_VISIBLE is set; errors are always echoed). If the
+    writer falls behind, the oldest lines are dropped rather than blocking the game.
+    
+    Messages are %-style templates formatted only if their level is enabled. Hot paths
+    check the level's flag first, so a disabled level costs one attribute lookup:
+    
+        if debug.debug_enabled:
+            debug.debug("Single tap: %s", action)
+    """
+    def __init__(self, main, level=config.LOG_LEVEL, log_path=config.LOG_PATH,
+                 capacity=config.LOG_BUFFER_SIZE, flush_interval=config.LOG_FLUSH_INTERVAL):
+        """
+        Args:
+            level (str or int): Lowest level logged, e.g. "info"
+            log_path (str): File the writer thread writes to ("" = only echo to stdout)
+            capacity (int): Lines held for the writer before the oldest are dropped
+            flush_interval (float): Seconds between writes
+        """
         self.main = main
         self.current_message = None
         self.message_type = None
         self.message_time = 0
         self.display_duration = 3000  # milliseconds (3 seconds)
+        
+        self.set_level(level)
+        self.echo = config.DEBUG_PRINT_VISIBLE
+        self.log_path = log_path
+        self.flush_interval = flush_interval
+        self.records = collections.deque(maxlen=capacity)  # (perf_counter time, level, message)
+        self.dropped = 0  # Lines lost because the buffer was full
+        self.origin = time.perf_counter()
+        
+        self.file = None
+        self.closed = False
+        self.wake = threading.Event()
+        self.thread = threading.Thread(target=self.writer_loop, name="log-writer", daemon=True)
+        self.thread.start()
+    
+    def set_level(self, level):
+        self.level = LEVELS[level] if isinstance(level, str) else level
+        # Flags for callers to check before building a message
+        self.debug_enabled = self.level <= DEBUG
+        self.info_enabled = self.level <= INFO
+    
+    def log(self, level, message, *args):
+        """
+        Queue a line for the writer thread. message % args is only formatted if level is enabled.
+        """
+        if level < self.level:
+            return
+        if args:
+            message = message % args
+        records = self.records
+        if len(records) == records.maxlen:
+            self.dropped += 1
+        records.append((time.perf_counter(), level, str(message)))
+        if level >= ERROR:
+            self.wake.set()
+    
+    def writer_loop(self):
+        while not self.closed:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+    
+    def flush(self):
+        """Write out every queued line (runs on the writer thread, and once more on close)"""
+        lines = []
+        echoed = []
+        records = self.records
+        while records:
+            try:
+                timestamp, level, message = records.popleft()
+            except IndexError:
+                break
+            line = f"{timestamp - self.origin:10.3f} [{LEVEL_NAMES.get(level, level)}]: {message}\n"
+            lines.append(line)
+            if self.echo or level >= ERROR:
+                echoed.append(line[11:])
+        if self.dropped:
+            lines.append(f"{time.perf_counter() - self.origin:10.3f} [Warning]: {self.dropped} log lines dropped\n")
+            self.dropped = 0
+        if not lines:
+            return
+        
+        if echoed:
+            sys.stdout.write("".join(echoed))
+            sys.stdout.flush()
+        if self.log_path:
+            if self.file is None:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                self.file = open(self.log_path, "w")
+            self.file.write("".join(lines))
+            self.file.flush()
+    
+    def close(self):
+        """Stop the writer thread and write what is left"""
+        if self.closed:
+            return
+        self.closed = True
+        self.wake.set()
+        self.thread.join()
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
     
     def _set_message(self, message, msg_type):
         """Store the message with timestamp for auto-clearing"""
@@ -29,26 +151,27 @@ class Debug:
         
         return [self.current_message, self.message_type]
     
-    def success(self, message):
-        if config.DEBUG_PRINT_VISIBLE:
-            print("[Success]: " + str(message))
+    def debug(self, message, *args):
+        # Log only, too frequent for the screen
+        self.log(DEBUG, message, *args)
+    
+    def success(self, message, *args):
+        self.log(SUCCESS, message, *args)
         if config.DEBUG_TEXT_VISIBLE:
-            self._set_message(message, "success")
+            self._set_message(message % args if args else message, "success")
     
-    def error(self, message):
-        # Always print the error messages whether enabled or not
-        print("[Error]: " + str(message))
+    def error(self, message, *args):
+        # Always logged and echoed to stdout whatever the level
+        self.log(ERROR, message, *args)
         if config.DEBUG_TEXT_VISIBLE:
-            self._set_message(message, "danger")
+            self._set_message(message % args if args else message, "danger")
     
-    def warning(self, message):
-        if config.DEBUG_PRINT_VISIBLE:
-            print("[Warning]: " + str(message))
+    def warning(self, message, *args):
+        self.log(WARNING, message, *args)
         if config.DEBUG_TEXT_VISIBLE:
-            self._set_message(message, "warning")
+            self._set_message(message % args if args else message, "warning")
     
-    def info(self, message):
-        if config.DEBUG_PRINT_VISIBLE:
-            print("[Info]: " + str(message))
+    def info(self, message, *args):
+        self.log(INFO, message, *args)
         if config.DEBUG_TEXT_VISIBLE:
-            self._set_message(message, "info")
\ No newline at end of file
+            self._set_message(message % args if args else message, "info")
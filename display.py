@@ -1,25 +1,45 @@
 """Display/window module."""
 
 import config
+import os
 import pygame
+import animation
+import bake_tricks
+import rotation_frames
+import trick_compiler
 
 class Display:
-    def __init__(self, screen):
+    def __init__(self, screen, assets, profiler, debug, latency):
         self.screen = screen
+        self.assets = assets
+        self.profiler = profiler
+        self.debug = debug
+        self.latency = latency
         self.font = pygame.font.Font(config.FONT_PATH, config.FONT_SIZE_SMALL)
         self.debug_text_position = (10, 10) 
+        
+        # Profiler overlay, re-rendered every config.PROFILER_OVERLAY_REFRESH frames
+        self.profiler_overlay = None
+        self.profiler_overlay_age = 0
         self.skateboard_sprite = None
+        self.zoom = config.CAMERA_ZOOM
+        
+        # Scaled trick frames: (trick_name, zoom, pixel_format) -> list of frame surfaces
+        self.frame_cache = {}
+        
+        # Board renders for arbitrary angles, decoded on demand
+        self.rotation_frames = rotation_frames.RotationFrameStore(
+            assets, self.zoom, config.ROTATION_FRAME_CACHE_BYTES, prefetch=config.ROTATION_FRAME_PREFETCH, debug=debug)
+        self.board_rotation = None  # (flip, shuv) to draw instead of the resting sprite, None = resting
+        
+        # Every running animation, advanced once per simulation step by Main
+        self.animations = animation.AnimationScheduler()
         
-        # Animation system state
+        # The board's trick animation is one of them
+        self.board_animation = None
         self.current_animation = None
         self.current_trick = None
-        self.animation_frames = []
-        self.animation_frame = 0
-        self.animation_running = False
-        self.animation_loop = False
-        self.last_frame_time = 0
         self.base_frame_duration = (1000 / config.ANIMATION_FRAME_RATE) / 2  # milliseconds per frame (2x speed)
-        self.frame_duration = self.base_frame_duration
         
         # Position skateboard over middle of tiles on left side of window
         # Based on tile positioning: px = ((rows * 16 - y * 16) * zoom) - 150, py = (rows * 8 + y * 8) * zoom
@@ -34,12 +54,18 @@ class Display:
         """
         
         skateboard_path = "./animations/Default.png"
-        self.skateboard_sprite = pygame.image.load(skateboard_path)
         
         # Scale skateboard to match level resolution using camera zoom
-        original_width, original_height = self.skateboard_sprite.get_size()
-        scaled_size = (int(original_width * (config.CAMERA_ZOOM)), int(original_height * (config.CAMERA_ZOOM)))
-        self.skateboard_sprite = pygame.transform.scale(self.skateboard_sprite, scaled_size)
+        self.skateboard_sprite = self.assets.load(skateboard_path, "board", self.zoom)
+    
+    def set_zoom(self, zoom):
+        """
+        Change the sprite zoom. Cached trick frames were scaled for the old zoom, so they are dropped.
+        """
+        self.zoom = zoom
+        self.frame_cache = {}
+        self.rotation_frames.set_zoom(zoom)
+        self.load_skateboard_sprite()
         
 
     def clear_screen(self):
@@ -68,33 +94,35 @@ class Display:
         """
         Draw the skateboard sprite. Shows default animation or current trick animation.
         """
-        if self.animation_running and self.current_animation and self.animation_frames:
+        if self.board_animation is not None:
             # Raise skateboard 100px when doing tricks
             trick_position = (self.skateboard_base_position[0], self.skateboard_base_position[1] - 50) # Jump 50px
             
-            # Draw current animation frame
-            current_time = pygame.time.get_ticks()
-            if current_time - self.last_frame_time >= self.frame_duration:
-                if self.animation_loop:
-                    # Loop animation while keys are held
-                    self.animation_frame = (self.animation_frame + 1) % len(self.animation_frames)
-                else:
-                    # Play animation once
-                    if self.animation_frame < len(self.animation_frames) - 1:
-                        self.animation_frame += 1
-                    else:
-                        # Animation finished, stop it
-                        self.stop_animation()
-                        return
-                self.last_frame_time = current_time
-            
-            # Use current frame from animation_frames list
-            current_sprite = self.animation_frames[self.animation_frame]
-            self.screen.blit(current_sprite, trick_position)
+            # The scheduler has already moved the animation to the right frame
+            self.screen.blit(self.board_animation.get_frame(), trick_position)
+        elif self.board_rotation is not None:
+            # Live rotation (not a baked trick), use the nearest render
+            self.screen.blit(self.rotation_frames.get_frame(*self.board_rotation), self.skateboard_base_position)
         else:
             # Draw default skateboard sprite at normal position
             self.screen.blit(self.skateboard_sprite, self.skateboard_base_position)
         
+    def set_board_rotation(self, flip, shuv, flip_speed=0, shuv_speed=0):
+        """
+        Show the board at any angle pair. Passing the rotation speed (degrees per step)
+        lets the store decode the next angles in the background.
+        
+        Args:
+            flip (float): Flip angle in degrees, or None to go back to the resting sprite
+            shuv (float): Shuv angle in degrees
+        """
+        if flip is None:
+            self.board_rotation = None
+            return
+        self.board_rotation = (flip, shuv)
+        if flip_speed or shuv_speed:
+            self.rotation_frames.prefetch_ahead(flip, shuv, flip_speed, shuv_speed)
+        
     def draw_obstacles(self):
         """
         Draw the obstacles.
@@ -113,23 +141,139 @@ class Display:
         
         Args:
             trick_name (str): Name of the trick
-            animation_sprite: Horizontal spritemap image containing all frames
+            animation_sprite: Horizontal spritemap image containing all frames (None if the frames are cached)
             loop (bool): Whether to loop the animation while keys are held
+        
+        Returns:
+            True if the animation started, False if the trick has no frames
         """
+        profiler = self.profiler
+        start = profiler.begin() if profiler.enabled else None
+        
+        # Scaled frames are shared between every start of the same trick
+        frames = self.get_animation_frames(trick_name, animation_sprite)
+        if not frames:
+            return False
+        
+        if self.board_animation is not None:
+            self.animations.stop(self.board_animation)
+        
         self.current_trick = trick_name
         self.current_animation = animation_sprite
         
-        # Set frame duration based on trick type
-        self.set_trick_speed(trick_name)
+        # Playback speed based on trick type
+        speed = self.get_trick_speed(trick_name)
+        self.board_animation = self.animations.play(frames, self.base_frame_duration, loop, speed,
+                                                    on_finish=lambda finished: self.stop_animation())
+        
+        if start is not None:
+            profiler.end("display.start_animation", start, trick_name)
+        
+        if self.debug.debug_enabled:
+            self.debug.debug("Started animation: %s with %d frames (loop: %s, speed: %sms)",
+                             trick_name, len(frames), loop, self.base_frame_duration / speed)
+        return True
+    
+    def get_pixel_format(self):
+        """Identify the screen's pixel format, frames are converted to it"""
+        return (self.screen.get_bitsize(), self.screen.get_masks())
+    
+    def get_animation_frames(self, trick_name, spritemap):
+        """
+        Return the scaled frames for a trick, extracting them from the spritemap only the first time.
+        
+        Args:
+            trick_name (str): Name of the trick
+            spritemap: Horizontal spritemap image containing all frames
+        """
+        key = (trick_name, self.zoom, self.get_pixel_format())
+        frames = self.frame_cache.get(key)
+        if frames is None:
+            frames = self.extract_frames_from_spritemap(spritemap)
+            self.frame_cache[key] = frames
+        return frames
+    
+    def has_animation_frames(self, trick_name):
+        """Check if a trick's frames are already cached for the current zoom and pixel format"""
+        return (trick_name, self.zoom, self.get_pixel_format()) in self.frame_cache
+    
+    def load_baked_frames(self, baked_path):
+        """
+        Fill the frame cache from the output of bake_tricks.py, for every trick whose
+        bake is up to date (same definition and zoom, and source renders with the same
+        size and modification time as when baked). Other tricks fall back to slicing
+        their spritemap.
+        
+        Returns:
+            Set of trick names loaded from the bake
+        """
+        manifest = bake_tricks.load_manifest(baked_path)
+        if manifest is None or manifest["zoom"] != self.zoom:
+            return set()
         
-        # Extract individual frames from the horizontal spritemap
-        self.animation_frames = self.extract_frames_from_spritemap(animation_sprite)
-        self.animation_frame = 0
-        self.animation_running = True
-        self.animation_loop = loop
-        self.last_frame_time = pygame.time.get_ticks()
+        definitions = trick_compiler.get_trick_definitions()
+        loaded = set()
+        for trick_name, entry in manifest["tricks"].items():
+            if trick_name not in definitions:
+                continue
+            if entry["definition"] != bake_tricks.get_definition(trick_name, self.zoom):
+                continue
+            if not self.is_bake_source_current(entry["sources"]):
+                continue
+            strip_path = os.path.join(baked_path, entry["file"])
+            if not os.path.exists(strip_path):
+                continue
+            
+            # Frames are already scaled, just cut views out of the strip (it is its own atlas)
+            strip = self.assets.load(strip_path, "baked tricks", packed=False)
+            frame_width, frame_height = entry["frame_size"]
+            frames = [strip.subsurface((index * frame_width, 0, frame_width, frame_height))
+                      for index in range(entry["frames"])]
+            self.frame_cache[(trick_name, self.zoom, self.get_pixel_format())] = frames
+            loaded.add(trick_name)
+        return loaded
+    
+    def is_bake_source_current(self, sources):
+        """Check the [path, size, modification time] a trick was baked from against the files"""
+        try:
+            return bake_tricks.get_source_signatures([path for path, size, mtime in sources]) == sources
+        except OSError:
+            return False
+    
+    def load_compiled_frames(self, sequences, skip=()):
+        """
+        Fill the frame cache straight from the rotation renders, for tricks that have
+        neither a bake nor a spritemap (e.g. one just added to config).
+        
+        Args:
+            sequences (dict): Trick name -> render indices from trick_compiler.compile_tricks
+            skip: Trick names that already have frames
+        
+        Returns:
+            Set of trick names loaded
+        """
+        loaded = set()
+        for trick_name, indices in sequences.items():
+            if trick_name in skip:
+                continue
+            frame_paths = trick_compiler.get_frame_paths(indices)
+            if not all(os.path.exists(path) for path in frame_paths):
+                continue
+            
+            frames = [self.assets.load(path, "rotation frames", self.zoom) for path in frame_paths]
+            self.frame_cache[(trick_name, self.zoom, self.get_pixel_format())] = frames
+            loaded.add(trick_name)
+        return loaded
+    
+    def preload_animation_frames(self, animations):
+        """
+        Build the frame cache for every trick up front so starting a trick is just a lookup.
         
-        print(f"Started animation: {trick_name} with {len(self.animation_frames)} frames (loop: {loop}, speed: {self.frame_duration}ms)")
+        Args:
+            animations (dict): Trick name -> spritemap surface
+        """
+        for trick_name, spritemap in animations.items():
+            self.get_animation_frames(trick_name, spritemap)
     
     def extract_frames_from_spritemap(self, spritemap):
         """
@@ -152,6 +296,9 @@ class Display:
         estimated_frame_count = spritemap_width // estimated_frame_width
         
         # Extract frames
+        profiler = self.profiler
+        start = profiler.begin() if profiler.enabled else None
+        
         for i in range(estimated_frame_count):
             # Calculate frame position
             frame_x = i * estimated_frame_width
@@ -167,42 +314,43 @@ class Display:
             
             # Scale frame to match skateboard size
             original_width, original_height = frame_surface.get_size()
-            scaled_size = (int(original_width * config.CAMERA_ZOOM), int(original_height * config.CAMERA_ZOOM))
+            scaled_size = (int(original_width * self.zoom), int(original_height * self.zoom))
             scaled_frame = pygame.transform.scale(frame_surface, scaled_size)
             
-            frames.append(scaled_frame)
+            frames.append(self.assets.convert(scaled_frame))
         
-        print(f"Extracted {len(frames)} frames from spritemap")
+        if start is not None:
+            profiler.end("display.extract_frames", start)
+        if self.debug.debug_enabled:
+            self.debug.debug("Extracted %d frames from spritemap", len(frames))
         return frames
     
-    def set_trick_speed(self, trick_name):
+    def get_trick_speed(self, trick_name):
         """
-        Set the frame duration based on the trick type.
+        Playback speed multiplier for a trick's animation, based on the trick type.
         
         Args:
             trick_name (str): Name of the trick
         """
-        # Reset to base speed first
-        self.frame_duration = self.base_frame_duration
-        
-        # Apply speed multipliers based on trick type
         if "360" in trick_name:
             # 360 shuv tricks are 2x slower
-            self.frame_duration *= 2.0
+            return 1 / 2.0
         elif any(x in trick_name.lower() for x in ["shuv", "flip"]) and ("180" in trick_name or "varial" in trick_name):
             # 180 shuv/flip tricks are 1.5x slower
-            self.frame_duration *= 1.5
+            return 1 / 1.5
+        return 1.0
     
     def stop_animation(self):
         """
         Stop the current animation and return to default sprite.
         """
-        self.animation_running = False
+        if self.board_animation is not None:
+            self.animations.stop(self.board_animation)
+            self.board_animation = None
         self.current_animation = None
         self.current_trick = None
-        self.animation_frames = []
-        self.animation_frame = 0
-        print("Stopped animation - returning to default")
+        if self.debug.debug_enabled:
+            self.debug.debug("Stopped animation - returning to default")
 
     def draw_debug(self, info):
         """
@@ -225,6 +373,56 @@ class Display:
         text = self.font.render(info[0], True, color)
         self.screen.blit(text, self.debug_text_position)
         
+    def draw_profiler(self):
+        """
+        Draw the profiler's rolling stats below the debug text: one row per span with
+        its mean / p95 / max in milliseconds and a histogram of its recent durations,
+        then the same for the input latency of each trick.
+        """
+        self.profiler_overlay_age += 1
+        if self.profiler_overlay is None or self.profiler_overlay_age >= config.PROFILER_OVERLAY_REFRESH:
+            self.profiler_overlay = self.render_profiler_overlay()
+            self.profiler_overlay_age = 0
+        
+        x, y = self.debug_text_position
+        self.screen.blit(self.profiler_overlay, (x, y + self.font.get_linesize()))
+    
+    def render_profiler_overlay(self):
+        # (label, stats, histogram, milliseconds above which a value shows red)
+        # Slow spans stand out over a 60 FPS frame, latencies over three frames
+        rows = [(name, self.profiler.get_stats(name), self.profiler.get_histogram(name), 16.7)
+                for name in self.profiler.get_names()]
+        rows += [("latency " + label, self.latency.get_stats(label), self.latency.get_histogram(label), 50)
+                 for label in self.latency.get_names()]
+        line_height = self.font.get_linesize()
+        name_width = 220
+        column_width = 60
+        bar_width = 4
+        histogram_x = name_width + column_width * 3
+        width = histogram_x + bar_width * 8 + 10
+        
+        overlay = pygame.Surface((width, line_height * (len(rows) + 1) + 6), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 160))
+        
+        header = ["span", "mean", "p95", "max"]
+        for column, text in enumerate(header):
+            label = self.font.render(text, True, config.COLORS['gray'])
+            overlay.blit(label, (4 + (name_width + column_width * (column - 1) if column else 0), 2))
+        
+        for row, (name, stats, histogram, slow) in enumerate(rows, start=1):
+            y = 2 + row * line_height
+            overlay.blit(self.font.render(name, True, config.COLORS['white']), (4, y))
+            for column, key in enumerate(("mean", "p95", "max")):
+                color = config.COLORS['danger'] if stats[key] > slow else config.COLORS['white']
+                overlay.blit(self.font.render(f"{stats[key]:.2f}", True, color), (4 + name_width + column_width * column, y))
+            
+            tallest = max(histogram)
+            for bucket, count in enumerate(histogram):
+                height = max(1, (line_height - 4) * count // tallest) if count else 0
+                overlay.fill(config.COLORS['accent'], (histogram_x + bucket * bar_width, y + line_height - 2 - height,
+                                                       bar_width - 1, height))
+        return overlay
+    
     def update(self):
         self.clear_screen()
         self.draw_scene()
@@ -0,0 +1,99 @@
+"""Input recording module."""
+
+import os
+import struct
+import time
+
+MAGIC = b"SK8I"
+VERSION = 2
+
+# Magic, version, simulation step length (ms), initial game state
+HEADER = struct.Struct("<4sHd16s")
+# Simulation tick, event kind, key code, offset into the step: 11 bytes per event
+EVENT = struct.Struct("<IBIH")
+
+# Offsets are in 1/OFFSET_SCALE of a simulation step
+OFFSET_SCALE = 65536
+
+KEY_DOWN = 0
+KEY_UP = 1
+END = 2  # Last record: tick = ticks played, key = state checksum over the whole run
+
+
+class InputRecorder:
+    """
+    Records the KEYDOWN/KEYUP events the game handles, stamped with the simulation
+    tick they arrived before and how far into that step they arrived. The game reads
+    time from these too (see Main.get_time), so playing the same events at the same
+    ticks and offsets reproduces the run.
+
+    Events are packed into memory and written out once by close().
+    """
+    def __init__(self, path, step_ms, game_state):
+        """
+        Args:
+            path (str): File to write, or a folder to create a timestamped file in
+            step_ms (float): Length of one simulation step
+            game_state (str): Game state the run started in
+        """
+        if path.endswith(("/", os.sep)) or os.path.isdir(path):
+            path = os.path.join(path, time.strftime("input-%Y%m%d-%H%M%S.sk8i"))
+        self.path = path
+        self.data = bytearray(HEADER.pack(MAGIC, VERSION, step_ms, game_state.encode()))
+        self.count = 0
+
+    def record(self, tick, kind, key, offset=0):
+        self.data += EVENT.pack(tick, kind, key, offset)
+        self.count += 1
+
+    def close(self, ticks, checksum):
+        """
+        Write the recording.
+
+        Args:
+            ticks (int): Simulation steps the run lasted
+            checksum (int): Main's state checksum after the last step, checked on replay
+
+        Returns:
+            Path of the written file
+        """
+        self.data += EVENT.pack(ticks, END, checksum, 0)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "wb") as file:
+            file.write(self.data)
+        return self.path
+
+
+class Recording:
+    """A loaded recording: events as (tick, kind, key, offset) in the order they were handled"""
+    def __init__(self, step_ms, game_state, events, ticks, checksum):
+        self.step_ms = step_ms
+        self.game_state = game_state
+        self.events = events
+        self.ticks = ticks
+        self.checksum = checksum
+
+
+def load_recording(path):
+    """
+    Read a file written by InputRecorder.
+
+    Raises:
+        ValueError: If the file isn't a complete recording of this version
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    if len(data) < HEADER.size + EVENT.size:
+        raise ValueError(f"{path} is too short to be a recording")
+    magic, version, step_ms, game_state = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} input recording")
+    if (len(data) - HEADER.size) % EVENT.size:
+        raise ValueError(f"{path} is truncated")
+
+    events = list(EVENT.iter_unpack(memoryview(data)[HEADER.size:]))
+    ticks, kind, checksum, offset = events.pop()
+    if kind != END:
+        raise ValueError(f"{path} has no end record (the game didn't exit cleanly)")
+    return Recording(step_ms, game_state.rstrip(b"\0").decode(), events, ticks, checksum)
@@ -0,0 +1,54 @@
+"""Input sampling module."""
+
+import collections
+import time
+import pygame
+
+
+class InputSampler:
+    """
+    Pumps the event queue more often than frames are rendered and timestamps every
+    event when it is picked up, so input timing isn't rounded to the frame rate.
+
+    Instead of sleeping through the frame cap in one go, wait_until() polls every
+    `poll_interval` seconds until the deadline. The main loop then takes the events
+    step by step (take_until), each with its time.
+
+    SDL only queues the event types in `event_types`, everything else is dropped
+    before it reaches the queue.
+    """
+    def __init__(self, event_types, poll_interval=0.001):
+        """
+        Args:
+            event_types (list): pygame event types the game handles
+            poll_interval (float): Seconds between polls while waiting for the next frame
+        """
+        self.poll_interval = poll_interval
+        self.events = collections.deque()  # (perf_counter time, event), oldest first
+
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(list(event_types))
+
+    def poll(self):
+        """Move everything SDL has queued into the sampler, stamped with the current time"""
+        events = pygame.event.get()
+        if events:
+            now = time.perf_counter()
+            self.events.extend((now, event) for event in events)
+
+    def wait_until(self, deadline):
+        """Poll until deadline (perf_counter seconds), sleeping in between"""
+        self.poll()
+        remaining = deadline - time.perf_counter()
+        while remaining > 0:
+            time.sleep(min(self.poll_interval, remaining))
+            self.poll()
+            remaining = deadline - time.perf_counter()
+
+    def take_until(self, until):
+        """Remove and return the (time, event) pairs up to time until, oldest first"""
+        events = self.events
+        taken = []
+        while events and events[0][0] <= until:
+            taken.append(events.popleft())
+        return taken
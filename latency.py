@@ -0,0 +1,105 @@
+"""Input latency module."""
+
+import collections
+import json
+import os
+import time
+import stage_timer
+
+# Upper edges of the histogram buckets in milliseconds (the last bucket takes everything above)
+HISTOGRAM_EDGES = (8, 16, 25, 33, 50, 66, 100)
+
+# Label every sample is also counted under
+ALL = "all"
+
+
+class LatencyTracker:
+    """
+    Input-to-photon latency: the time from a key event arriving to the first presented
+    frame that shows what it caused (a trick starting).
+
+    Main stamps each key event with its arrival time before handling it (set_input_time),
+    Control reports the visible effect (begin), and Main resolves every pending effect
+    right after presenting the frame (presented).
+
+    Histograms count every sample of the session, the stats use the latest `window` samples.
+    """
+    def __init__(self, window=240):
+        self.window = window
+        self.input_time = None  # Arrival (perf_counter) of the key event being handled
+        self.pending = []  # (label, arrival) started but not presented yet
+        self.last_begun = None  # The same input can restart a trick, it is only measured once
+        self.samples = {}  # Dictionary: label -> deque of the latest latencies in milliseconds
+        self.histograms = {}  # Dictionary: label -> counts per HISTOGRAM_EDGES bucket
+
+    def set_input_time(self, arrival):
+        """arrival: perf_counter time the event arrived, None for events without one (replays)"""
+        self.input_time = arrival
+
+    def begin(self, label):
+        """Something the current input caused will be on the next presented frame"""
+        if self.input_time is None or (label, self.input_time) == self.last_begun:
+            return
+        self.last_begun = (label, self.input_time)
+        self.pending.append(self.last_begun)
+
+    def presented(self):
+        """Call right after the frame reached the screen"""
+        if not self.pending:
+            return
+        now = time.perf_counter()
+        for label, arrival in self.pending:
+            latency = (now - arrival) * 1000
+            self.add(label, latency)
+            self.add(ALL, latency)
+        self.pending = []
+
+    def add(self, label, latency):
+        samples = self.samples.get(label)
+        if samples is None:
+            samples = self.samples[label] = collections.deque(maxlen=self.window)
+            self.histograms[label] = [0] * (len(HISTOGRAM_EDGES) + 1)
+        samples.append(latency)
+        self.histograms[label][stage_timer.get_histogram_bucket(HISTOGRAM_EDGES, latency)] += 1
+
+    def get_stats(self, label):
+        """
+        Returns:
+            Dictionary with "mean", "p50", "p95" and "max" in milliseconds, plus "count" (whole session)
+        """
+        samples = list(self.samples[label])
+        ordered = sorted(samples)
+        return {
+            "count": sum(self.histograms[label]),
+            "mean": sum(samples) / len(samples),
+            "p50": stage_timer.get_percentile(ordered, 50),
+            "p95": stage_timer.get_percentile(ordered, 95),
+            "max": ordered[-1],
+        }
+
+    def get_histogram(self, label):
+        return self.histograms[label]
+
+    def get_names(self):
+        """Labels with samples, the combined one first"""
+        return sorted(self.samples, key=lambda label: (label != ALL, label))
+
+    def export(self, folder):
+        """
+        Write every label's stats and histogram to a new JSON file in folder.
+
+        Returns:
+            Path of the written file, or None if nothing was measured
+        """
+        if not self.samples:
+            return None
+        report = {
+            "histogram_edges_ms": HISTOGRAM_EDGES,
+            "latency": {label: dict(self.get_stats(label), histogram=self.histograms[label])
+                        for label in self.get_names()},
+        }
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, time.strftime("latency-%Y%m%d-%H%M%S.json"))
+        with open(path, "w") as file:
+            json.dump(report, file, indent=1)
+        return path
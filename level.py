@@ -4,6 +4,38 @@ import config
 import os
 import pygame
 import math
+import spatial
+import chunk_loader
+import chunk_cache
+import array
+
+# Tile IDs stored in chunk grids (index into Level.tile_textures)
+TILE_EMPTY = 0
+TILE_1 = 1
+TILE_2 = 2
+TILE_3 = 3
+
+
+class Chunk:
+    """
+    A square grid of tile IDs stored as one byte per tile.
+    Cell (local_x, local_y) is at tiles[local_x * size + local_y].
+    Screen positions are not stored, Level computes them from the chunk coordinates.
+    """
+    __slots__ = ("chunk_x", "chunk_y", "size", "tiles")
+    
+    def __init__(self, chunk_x, chunk_y, size, tiles=None):
+        self.chunk_x = chunk_x
+        self.chunk_y = chunk_y
+        self.size = size
+        self.tiles = tiles if tiles is not None else array.array("B", bytes(size * size))
+    
+    def get_tile(self, local_x, local_y):
+        return self.tiles[local_x * self.size + local_y]
+    
+    def set_tile(self, local_x, local_y, tile_id):
+        self.tiles[local_x * self.size + local_y] = tile_id
+
 
 class Level:
     def __init__(self, display, main):
@@ -12,58 +44,237 @@ class Level:
         
         self.zoom = config.CAMERA_ZOOM
         
+        # Baked chunk surfaces: (chunk_x, chunk_y) -> (surface, origin_x, origin_y)
+        self.chunk_surfaces = {}
+        
+        # Scrolling render mode: persistent level image that is shifted instead of redrawn
+        self.background = None
+        self.background_camera = (0, 0)  # Whole-pixel camera position the background was drawn at
+        self.background_dirty = True  # Set when on-screen chunks change, forces a full redraw
+        
+        # Built chunks (active window pinned, recently unloaded ones kept until evicted)
+        self.chunk_cache = chunk_cache.ChunkCache(config.CHUNK_CACHE_MAX_CHUNKS, config.CHUNK_CACHE_MAX_BYTES)
+        
         self.load_textures()
         
         # Camera system
         self.camera_x = 0.0
         self.camera_y = 0.0
+        self.camera_velocity_x = 0.0  # Pixels moved during the last update
+        
+        # Camera position before the last update, for interpolating between simulation steps
+        self.previous_camera_x = 0.0
+        self.previous_camera_y = 0.0
+        
+        # Camera offset used for drawing (interpolated), set by draw_level
+        self.render_camera_x = 0.0
+        self.render_camera_y = 0.0
         
         # Chunk system - proper infinite terrain approach
         self.chunk_size = 8  # 8x8 tiles per chunk
-        self.loaded_chunks = {}  # Dictionary: (chunk_x, chunk_y) -> tiles
+        self.loaded_chunks = {}  # Dictionary: (chunk_x, chunk_y) -> Chunk
         self.chunk_load_distance = 3  # Load chunks within 3 chunks of camera
         
+        # Spatial index over world-space bounds so drawing only visits what overlaps the camera
+        self.chunk_index = spatial.SpatialGrid(512)  # chunk_key -> chunk bounds (tiles: see get_tiles_in)
+        
+        # Position of every cell relative to its chunk origin, shared by all chunks
+        self.build_tile_offsets()
+        
         # Calculate viewport bounds
         self.viewport_width = config.DISPLAY_WIDTH // config.CAMERA_ZOOM
         self.viewport_height = config.DISPLAY_HEIGHT // config.CAMERA_ZOOM
         
+        # Chunks are generated on a worker thread while scrolling
+        self.chunk_loader = None
+        if config.CHUNK_LOADER_THREADED:
+            self.chunk_loader = chunk_loader.ChunkLoader(
+                self.create_chunk,
+                (lambda chunk: self.bake_chunk(chunk, convert=False)) if config.BAKE_CHUNKS else None,
+            )
+        
         # Initialize with chunks around origin
-        self.update_chunks()
+        self.update_chunks(blocking=True)
 
     def load_textures(self):
         """Load and pre-scale textures for better performance"""
         self.floor_texture_location = config.FLOOR_TEXTURES_PATH
         
-        # Load base textures
-        base_tile1 = pygame.image.load(self.floor_texture_location + "Tile1.png")
-        base_tile2 = pygame.image.load(self.floor_texture_location + "Tile2.png")
-        base_tile3 = pygame.image.load(self.floor_texture_location + "Tile3.png")
+        assets = self.main.assets
         
-        # Pre-scale textures to avoid runtime scaling
-        scaled_size = (int(base_tile1.get_width() * self.zoom), int(base_tile1.get_height() * self.zoom))
-        self.Tile1 = pygame.transform.scale(base_tile1, scaled_size)
-        self.Tile2 = pygame.transform.scale(base_tile2, scaled_size)
-        self.Tile3 = pygame.transform.scale(base_tile3, scaled_size)
+        # Textures come pre-scaled to the zoom from the asset manager
+        self.Tile1 = assets.load(self.floor_texture_location + "Tile1.png", "tiles", self.zoom)
+        self.Tile2 = assets.load(self.floor_texture_location + "Tile2.png", "tiles", self.zoom)
+        self.Tile3 = assets.load(self.floor_texture_location + "Tile3.png", "tiles", self.zoom)
         
         # Load stair textures if needed
-        self.StairTile1 = pygame.image.load(self.floor_texture_location + "StairTile1.png")
-        self.StairTile2 = pygame.image.load(self.floor_texture_location + "StairTile2.png")
+        self.StairTile1 = assets.load(self.floor_texture_location + "StairTile1.png", "stair tiles", self.zoom)
+        self.StairTile2 = assets.load(self.floor_texture_location + "StairTile2.png", "stair tiles", self.zoom)
+        
+        # Tile ID -> texture, chunks only store the IDs
+        self.tile_textures = [None, self.Tile1, self.Tile2, self.Tile3]
         
+        # Baked chunks hold copies of the old textures, so they have to be rebuilt
+        self.invalidate_chunk_surfaces()
+    
+    def set_zoom(self, zoom):
+        """
+        Change the level zoom. Textures are rescaled and every loaded chunk is
+        rebuilt because tile positions and baked surfaces depend on the zoom.
+        """
+        self.zoom = zoom
+        self.viewport_width = config.DISPLAY_WIDTH // zoom
+        self.viewport_height = config.DISPLAY_HEIGHT // zoom
+        self.clear_chunks()
+        if self.chunk_loader:
+            self.chunk_loader.reset()
+        self.load_textures()
+        self.build_tile_offsets()
+        self.update_chunks(blocking=True)
+    
+    def invalidate_chunk_surfaces(self):
+        """
+        Drop every baked chunk surface and re-bake the loaded chunks with the current textures.
+        Cached chunks keep their tile grids and are re-baked when revived.
+        """
+        self.chunk_surfaces = {}
+        self.background_dirty = True
+        self.chunk_cache.drop_surfaces()
+        if config.BAKE_CHUNKS:
+            for chunk_key, chunk in getattr(self, "loaded_chunks", {}).items():
+                self.chunk_surfaces[chunk_key] = self.bake_chunk(chunk)
+                self.chunk_cache.put(chunk_key, chunk, self.chunk_surfaces[chunk_key], pinned=True)
                    
-    def draw_level(self):
-        """Draw all visible tiles from loaded chunks"""
-        for chunk_key, tiles in self.loaded_chunks.items():
-            for tile_data in tiles:
-                tile_texture, tile_x, tile_y = tile_data
-                # Apply camera offset
-                screen_x = tile_x + self.camera_x
-                screen_y = tile_y + self.camera_y
-                
-                # Only draw tiles that are potentially visible
-                if (screen_x > -64 and screen_x < config.DISPLAY_WIDTH + 64 and 
-                    screen_y > -64 and screen_y < config.DISPLAY_HEIGHT + 64):
-                    self.display.screen.blit(tile_texture, (screen_x, screen_y))
+    def get_camera_rect(self, camera_x=None, camera_y=None):
+        """Return the area of the world covered by the screen (at the current camera by default)"""
+        if camera_x is None:
+            camera_x, camera_y = self.camera_x, self.camera_y
+        left = math.floor(-camera_x)
+        top = math.floor(-camera_y)
+        return pygame.Rect(left, top, config.DISPLAY_WIDTH + 1, config.DISPLAY_HEIGHT + 1)
+    
+    def overlaps_view(self, rect):
+        """Check a world rect against the screen at the latest and previous camera (drawing interpolates between them)"""
+        return (rect.colliderect(self.get_camera_rect()) or
+                rect.colliderect(self.get_camera_rect(self.previous_camera_x, self.previous_camera_y)))
+    
+    def get_visible_chunks(self):
+        """Return the keys of loaded chunks overlapping the camera, back to front"""
+        return self.chunk_index.query(self.get_camera_rect())
+    
+    def get_visible_tiles(self):
+        """Return (chunk_key, tile index) for every loaded tile overlapping the camera, back to front"""
+        return self.get_tiles_in(self.get_camera_rect())
+    
+    def get_tiles_in(self, world_rect):
+        """Return (chunk_key, tile index) for every loaded tile overlapping a world-space rect, back to front"""
+        tiles = []
+        left, top, right, bottom = world_rect.left, world_rect.top, world_rect.right, world_rect.bottom
+        textures = self.tile_textures
+        tile_offsets = self.tile_offsets
+        for chunk_key in self.chunk_index.query(world_rect):
+            chunk = self.loaded_chunks[chunk_key]
+            origin_x, origin_y = self.get_chunk_origin(chunk.chunk_x)
+            # Chunks come back in depth order and cells in grid order, which is the draw order
+            for tile_number, tile_id in enumerate(chunk.tiles):
+                if tile_id == TILE_EMPTY:
+                    continue
+                tile_x = origin_x + tile_offsets[tile_number][0]
+                tile_y = origin_y + tile_offsets[tile_number][1]
+                tile_width, tile_height = textures[tile_id].get_size()
+                if tile_x < right and tile_x + tile_width > left and tile_y < bottom and tile_y + tile_height > top:
+                    tiles.append((chunk_key, tile_number))
+        return tiles
+                   
+    def draw_level(self, alpha=1.0):
+        """
+        Draw all visible chunks (one blit per baked chunk).
+        alpha interpolates the camera between the previous and latest update (1 = latest).
+        """
+        self.render_camera_x = self.previous_camera_x + (self.camera_x - self.previous_camera_x) * alpha
+        self.render_camera_y = self.previous_camera_y + (self.camera_y - self.previous_camera_y) * alpha
+        
+        profiler = self.main.profiler
+        start = profiler.begin() if profiler.enabled else None
+        
+        if config.LEVEL_RENDER_MODE == "scroll":
+            self.draw_level_scrolling()
+        else:
+            camera_rect = self.get_camera_rect(self.render_camera_x, self.render_camera_y)
+            self.draw_region(self.display.screen, camera_rect, self.render_camera_x, self.render_camera_y)
+        
+        if start is not None:
+            profiler.end("level.blit_chunks", start)
+    
+    def draw_region(self, target, world_rect, offset_x, offset_y):
+        """
+        Draw the chunks (or tiles of unbaked chunks) overlapping a world-space rect onto
+        a surface, shifted by the given offset (the camera position when drawing the screen).
+        """
+        for chunk_key in self.chunk_index.query(world_rect):
+            baked = self.chunk_surfaces.get(chunk_key)
+            if baked is not None:
+                surface, origin_x, origin_y = baked
+                target.blit(surface, (origin_x + offset_x, origin_y + offset_y))
+        
+        # Fall back to per-tile drawing for chunks that are not baked
+        if len(self.chunk_surfaces) < len(self.loaded_chunks):
+            for chunk_key, tile_number in self.get_tiles_in(world_rect):
+                if chunk_key in self.chunk_surfaces:
+                    continue
+                chunk = self.loaded_chunks[chunk_key]
+                origin_x, origin_y = self.get_chunk_origin(chunk.chunk_x)
+                tile_offset_x, tile_offset_y = self.tile_offsets[tile_number]
+                target.blit(self.tile_textures[chunk.tiles[tile_number]],
+                            (origin_x + tile_offset_x + offset_x, origin_y + tile_offset_y + offset_y))
+    
+    def draw_level_scrolling(self):
+        """
+        Draw the level by scrolling last frame's level image by the camera movement
+        and only drawing the newly exposed strips along the edges.
+        The camera is snapped to whole pixels in this mode.
+        """
+        screen = self.display.screen
+        width, height = screen.get_size()
+        camera_x = math.floor(self.render_camera_x)
+        camera_y = math.floor(self.render_camera_y)
+        
+        if self.background is None or self.background.get_size() != (width, height):
+            self.background = pygame.Surface((width, height))
+            if pygame.display.get_surface() is not None:
+                self.background = self.background.convert()
+            self.background_dirty = True
+        
+        dx = camera_x - self.background_camera[0]
+        dy = camera_y - self.background_camera[1]
+        
+        if self.background_dirty or abs(dx) >= width or abs(dy) >= height:
+            exposed = [pygame.Rect(0, 0, width, height)]
+        else:
+            self.background.scroll(dx, dy)
+            
+            # The L-shaped strip uncovered by the scroll, as (up to) two rects
+            exposed = []
+            if dx > 0:
+                exposed.append(pygame.Rect(0, 0, dx, height))
+            elif dx < 0:
+                exposed.append(pygame.Rect(width + dx, 0, -dx, height))
+            if dy > 0:
+                exposed.append(pygame.Rect(0, 0, width, dy))
+            elif dy < 0:
+                exposed.append(pygame.Rect(0, height + dy, width, -dy))
         
+        for rect in exposed:
+            self.background.set_clip(rect)
+            self.background.fill(config.COLORS['background'], rect)
+            self.draw_region(self.background, rect.move(-camera_x, -camera_y), camera_x, camera_y)
+        self.background.set_clip(None)
+        
+        self.background_camera = (camera_x, camera_y)
+        self.background_dirty = False
+        
+        screen.blit(self.background, (0, 0))
+    
     def get_camera_chunk_coords(self):
         """Convert camera position to chunk coordinates"""
         # Based on the original coordinate system from the commented code
@@ -85,37 +296,183 @@ class Level:
         return chunk_x, chunk_y
     
     def create_chunk(self, chunk_x, chunk_y):
-        """Create a chunk at specific coordinates using original coordinate system"""
-        tiles = []
+        """Create the tile grid for a chunk at specific coordinates (also called on the loader thread)"""
+        profiler = self.main.profiler
+        start = profiler.begin() if profiler.enabled else None
+        
+        size = self.chunk_size
         
         # Calculate the starting row for this chunk
+        start_row = chunk_x * size
+        
+        # Checkerboard of the two floor tiles
+        tiles = array.array("B", bytes(
+            TILE_2 if (start_row + local_x + local_y) % 2 == 0 else TILE_3
+            for local_x in range(size)
+            for local_y in range(size)
+        ))
+        
+        if start is not None:
+            profiler.end("level.create_chunk", start)
+        return Chunk(chunk_x, chunk_y, size, tiles)
+    
+    def build_tile_offsets(self):
+        """
+        Precompute each cell's position relative to the chunk origin for the current zoom.
+        Original coordinate calculation: px = ((row * 16 - y * 16) * zoom) - 150, py = (row * 8 + y * 8) * zoom
+        """
+        self.tile_offsets = [((local_x * 16 - local_y * 16) * self.zoom, (local_x * 8 + local_y * 8) * self.zoom)
+                             for local_x in range(self.chunk_size)
+                             for local_y in range(self.chunk_size)]
+    
+    def get_chunk_origin(self, chunk_x):
+        """World position of a chunk's first cell (local_x = 0, local_y = 0)"""
         start_row = chunk_x * self.chunk_size
+        return (start_row * 16 * self.zoom) - 150, (start_row * 8) * self.zoom
+    
+    def get_tile_positions(self, chunk):
+        """
+        Return (tile_id, world_x, world_y) for every non-empty cell of a chunk, in draw order.
+        """
+        origin_x, origin_y = self.get_chunk_origin(chunk.chunk_x)
+        return [(tile_id, origin_x + offset_x, origin_y + offset_y)
+                for tile_id, (offset_x, offset_y) in zip(chunk.tiles, self.tile_offsets)
+                if tile_id != TILE_EMPTY]
+    
+    def get_tile_at(self, row, column):
+        """
+        Return the tile ID at a world grid position, or None if that chunk isn't loaded.
+        """
+        if column < 0 or column >= self.chunk_size:
+            return None
+        chunk = self.loaded_chunks.get((row // self.chunk_size, 0))
+        if chunk is None:
+            return None
+        return chunk.get_tile(row % self.chunk_size, column)
+    
+    def get_chunk_bounds(self, chunk_x, chunk_y):
+        """Return the world-space rect a chunk will cover, without building it"""
+        tile_width, tile_height = self.Tile2.get_size()
+        start_row = chunk_x * self.chunk_size
+        last = self.chunk_size - 1
         
-        for local_x in range(self.chunk_size):
-            row = start_row + local_x
-            for local_y in range(self.chunk_size):
-                # Use the original coordinate system
-                tile = self.Tile2 if (row + local_y) % 2 == 0 else self.Tile3
-                
-                # Original coordinate calculation
-                px = ((row * 16 - local_y * 16) * self.zoom) - 150
-                py = (row * 8 + local_y * 8) * self.zoom
-                
-                tiles.append((tile, px, py))
+        # Same projection as create_chunk, at the extreme rows / columns of the chunk
+        left = ((start_row * 16 - last * 16) * self.zoom) - 150
+        right = (((start_row + last) * 16) * self.zoom) - 150 + tile_width
+        top = (start_row * 8) * self.zoom
+        bottom = ((start_row + last) * 8 + last * 8) * self.zoom + tile_height
+        return pygame.Rect(left, top, right - left, bottom - top)
+    
+    def bake_chunk(self, chunk, convert=True):
+        """
+        Composite the tiles of a chunk onto a single transparent surface.
+        Pass convert=False when baking off the main thread, update_chunks converts it later.
         
-        return tiles
+        Returns:
+            (surface, origin_x, origin_y) where the origin is the world position
+            of the surface's top-left corner (add the camera offset to draw it)
+        """
+        profiler = self.main.profiler
+        start = profiler.begin() if profiler.enabled else None
+        
+        bounds = self.get_chunk_bounds(chunk.chunk_x, chunk.chunk_y)
+        origin_x, origin_y = bounds.topleft
+        
+        surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        # Tiles are blitted in grid order so the diamond overlaps stay the same as per-tile drawing
+        textures = self.tile_textures
+        surface.blits([(textures[tile_id], (tile_x - origin_x, tile_y - origin_y))
+                       for tile_id, tile_x, tile_y in self.get_tile_positions(chunk)],
+                      doreturn=False)
+        
+        if convert:
+            surface = self.main.assets.convert(surface)
+        
+        if start is not None:
+            profiler.end("level.bake_chunk", start)
+        return surface, origin_x, origin_y
     
-    def update_chunks(self):
-        """Update loaded chunks based on camera position"""
-        camera_chunk_x, camera_chunk_y = self.get_camera_chunk_coords()
+    def add_chunk(self, chunk_key, chunk, baked=None):
+        """
+        Make a chunk active: index its bounds, bake it if enabled and pin it in the cache.
+        A given bake is used as is, so it must already be in the display format.
+        """
+        self.loaded_chunks[chunk_key] = chunk
+        
+        depth = chunk_key[0]  # Higher rows are further down the screen, so draw them later
+        bounds = self.get_chunk_bounds(chunk.chunk_x, chunk.chunk_y)
+        self.chunk_index.insert(chunk_key, bounds, depth)
+        if self.overlaps_view(bounds):
+            self.background_dirty = True
+        
+        if config.BAKE_CHUNKS:
+            if baked is None:
+                baked = self.bake_chunk(chunk)
+            self.chunk_surfaces[chunk_key] = baked
         
+        self.chunk_cache.put(chunk_key, chunk, baked, pinned=True)
+    
+    def remove_chunk(self, chunk_key):
+        """Deactivate a chunk, it stays in the cache (with its bake) until evicted"""
+        self.loaded_chunks.pop(chunk_key)
+        self.chunk_surfaces.pop(chunk_key, None)
+        if self.overlaps_view(self.chunk_index.get_rect(chunk_key)):
+            self.background_dirty = True
+        self.chunk_index.remove(chunk_key)
+        self.chunk_cache.unpin(chunk_key)
+    
+    def clear_chunks(self):
+        self.loaded_chunks = {}
+        self.chunk_surfaces = {}
+        self.chunk_index.clear()
+        self.chunk_cache.clear()
+        self.background_dirty = True
+    
+    def get_chunk_window(self, camera_chunk_x, camera_chunk_y):
+        """Return the chunk keys within chunk_load_distance of a chunk"""
         # For the original system, we mainly need chunks ahead and behind
         # Load chunks ahead (positive x) and behind (negative x) the camera
-        chunks_to_load = set()
+        chunks = set()
         for dx in range(-self.chunk_load_distance, self.chunk_load_distance + 1):
             chunk_x = camera_chunk_x + dx
             chunk_y = camera_chunk_y  # Keep y at 0 for now
-            chunks_to_load.add((chunk_x, chunk_y))
+            chunks.add((chunk_x, chunk_y))
+        return chunks
+    
+    def update_chunks(self, blocking=False):
+        """
+        Update loaded chunks based on camera position.
+        
+        With the threaded loader, missing chunks are requested from the worker and
+        picked up on a later frame. Only a missing chunk that is already on screen is
+        built synchronously, which prefetching avoids during normal scrolling.
+        Pass blocking=True to build every missing chunk right away.
+        """
+        profiler = self.main.profiler
+        start = profiler.begin() if profiler.enabled else None
+        
+        camera_chunk_x, camera_chunk_y = self.get_camera_chunk_coords()
+        chunks_to_load = self.get_chunk_window(camera_chunk_x, camera_chunk_y)
+        
+        # Prefetch the chunks around where the camera will be, based on its velocity
+        if self.chunk_loader:
+            predicted_row = int(-(self.camera_x + self.camera_velocity_x * config.CHUNK_PREFETCH_FRAMES) / (16 * self.zoom))
+            predicted_chunk_x = predicted_row // self.chunk_size
+            if predicted_chunk_x != camera_chunk_x:
+                chunks_to_load |= self.get_chunk_window(predicted_chunk_x, camera_chunk_y)
+            
+            # Pick up chunks the worker has finished, converting and adding them counts against the budget
+            for chunk_key, chunk, baked in self.chunk_loader.drain(config.CHUNK_LOAD_BUDGET_MS):
+                if chunk_key in self.loaded_chunks:
+                    continue
+                if baked is not None:
+                    surface, origin_x, origin_y = baked
+                    baked = (self.main.assets.convert(surface), origin_x, origin_y)
+                if chunk_key in chunks_to_load:
+                    self.add_chunk(chunk_key, chunk, baked)
+                else:
+                    # No longer needed right now, but keep it in case the camera comes back
+                    self.chunk_cache.put(chunk_key, chunk, baked)
         
         # Remove chunks that are no longer needed
         chunks_to_remove = []
@@ -124,22 +481,52 @@ class Level:
                 chunks_to_remove.append(chunk_key)
         
         for chunk_key in chunks_to_remove:
-            del self.loaded_chunks[chunk_key]
+            self.remove_chunk(chunk_key)
         
         # Load new chunks
+        camera_rect = self.get_camera_rect()
         for chunk_x, chunk_y in chunks_to_load:
             chunk_key = (chunk_x, chunk_y)
-            if chunk_key not in self.loaded_chunks:
-                self.loaded_chunks[chunk_key] = self.create_chunk(chunk_x, chunk_y)
+            if chunk_key in self.loaded_chunks:
+                continue
+            
+            # A chunk already on screen can't wait for the worker, even if it was requested earlier
+            # (the worker's copy is dropped when it arrives, as the chunk is loaded by then)
+            needed_now = blocking or self.get_chunk_bounds(chunk_x, chunk_y).colliderect(camera_rect)
+            if self.chunk_loader and not needed_now and chunk_key in self.chunk_loader.pending:
+                continue
+            
+            # Revive recently unloaded chunks without rebuilding them
+            cached = self.chunk_cache.get(chunk_key)
+            if cached is not None:
+                chunk, baked = cached
+                self.add_chunk(chunk_key, chunk, baked)
+                continue
+            
+            if self.chunk_loader and not needed_now:
+                self.chunk_loader.request(chunk_key, priority=abs(chunk_x - camera_chunk_x))
+            else:
+                if self.chunk_loader:
+                    self.chunk_loader.cancel(chunk_key)
+                self.add_chunk(chunk_key, self.create_chunk(chunk_x, chunk_y))
         
+        if start is not None:
+            profiler.end("level.update_chunks", start)
+
     def update_camera(self):
         camera_speed = config.CAMERA_SPEED
+        self.previous_camera_x = self.camera_x
+        self.previous_camera_y = self.camera_y
         #Scroll the camera by the camera speed (subtract because the level goes backwards).
         #Camera Y location is divided by 2 due to isometric view
         self.camera_x -= camera_speed
         self.camera_y -= camera_speed / 2 
+        self.camera_velocity_x = -camera_speed
         
         # Update chunks based on new camera position
         self.update_chunks()
-            
-        
\ No newline at end of file
+    
+    def shutdown(self):
+        """Stop the background chunk worker"""
+        if self.chunk_loader:
+            self.chunk_loader.stop()
@@ -1,5 +1,9 @@
 """Main module for the skateboard game."""
 
+import argparse
+import os
+import time
+import zlib
 import pygame
 import config
 import display
@@ -7,30 +11,84 @@ import level
 import control
 import ui
 import debug
+import assets
+import stage_timer
+import profiler
+import tracer
+import sound_bank
+import input_recording
+import latency
+import input_sampler
 
 
 
 class Main:
-    def __init__(self):
+    def __init__(self, headless=config.HEADLESS, max_frames=config.HEADLESS_FRAMES,
+                 duration=config.HEADLESS_DURATION, present=None,
+                 record_path=config.RECORDING_PATH if config.RECORD_INPUT else None):
+        """
+        Args:
+            headless (bool): Run without a window, uncapped, and report stage timings at exit
+            max_frames (int): Stop after this many frames (0 = no limit)
+            duration (float): Stop after this many seconds (0 = no limit)
+            present (bool): Call pygame.display.update each frame (default: always, unless headless)
+            record_path (str): Record the key events to this file (or folder) for --replay
+        """
         self.running = True
+        self.exited = False
         
         self.game_state = "menu"
         self.player_state = "rolling"
         
+        self.headless = headless
+        self.max_frames = max_frames
+        self.duration = duration
+        self.present = (not headless or config.HEADLESS_PRESENT) if present is None else present
+        # Only timed in headless runs, so normal play pays nothing for it
+        self.stage_timer = stage_timer.StageTimer() if headless else None
+        if headless:
+            # Must be set before pygame.init
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        
         pygame.init()
         self.screen = pygame.display.set_mode((config.DISPLAY_WIDTH, config.DISPLAY_HEIGHT))
         pygame.display.set_caption("Super-Sk8!")
         
-        self.clock = pygame.time.Clock()
+        # Only the event types handled in handle_events reach the queue
+        self.input = input_sampler.InputSampler([pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP], config.INPUT_POLL_INTERVAL)
+        self.step_ms = 1000 / config.SIMULATION_RATE  # Length of one simulation step
+        self.tick = 0  # Simulation steps run so far, the game's clock (see get_time)
+        
+        # Key event recording, and a checksum of the simulation state after every step to check replays against
+        self.recorder = None
+        self.state_checksum = None
+        if record_path:
+            self.recorder = input_recording.InputRecorder(record_path, self.step_ms, self.game_state)
+            self.state_checksum = 0
 
         # --- Initialize the modules ---
         self.main = self
-        self.display = display.Display(self.screen)
+        self.assets = assets.Assets()
+        if config.USE_TEXTURE_ATLAS:
+            self.assets.load_atlas(config.ATLAS_CACHE_PATH)
+        self.tracer = tracer.Tracer(config.TRACE_CAPACITY) if config.TRACE_ENABLED else None
+        self.profiler = profiler.Profiler(config.PROFILER_ENABLED, config.PROFILER_WINDOW, self.tracer)
         self.debug = debug.Debug(self.main)
+        self.latency = latency.LatencyTracker(config.LATENCY_WINDOW)
+        self.display = display.Display(self.screen, self.assets, self.profiler, self.debug, self.latency)
+        self.sounds = sound_bank.SoundBank(config.SOUND_PATHS, config.SOUND_VOICES, config.SOUND_VOLUME, config.SOUND_PRELOAD)
         self.level = level.Level(self.display, self.main)
         self.control = control.Control(self.display, self.main)
         self.ui = ui.UI(self.display)
         
+        # Repack if anything was loaded that the saved atlas didn't have (first launch or changed files)
+        self.save_atlas_if_stale()
+        
+        if self.debug.debug_enabled:
+            for line in self.assets.report():
+                self.debug.debug("Assets: %s", line)
+        
         
         
 
@@ -38,50 +96,316 @@ class Main:
         
         self.display.clear_screen()
         
+        # Fixed timestep: the simulation always advances in steps of the same length,
+        # however fast or slow frames are rendered
+        step_ms = self.step_ms
+        accumulator = 0.0
+        frames = 0
+        end_time = time.perf_counter() + self.duration if self.duration else None
+        if self.stage_timer is not None:
+            self.stage_timer.reset()
+        last_time = next_frame = time.perf_counter()
+        
         while self.running:
-            self.clock.tick(config.FPS) #Set the pygame clock to the FPS
+            # Wait out the frame cap, sampling input meanwhile
+            if config.RENDER_UNCAPPED or self.headless:
+                self.input.poll()
+            else:
+                # Running late starts the next frame now rather than rushing to catch up
+                next_frame = max(next_frame + 1 / config.FPS, time.perf_counter())
+                self.input.wait_until(next_frame)
+            now = time.perf_counter()
+            accumulator += (now - last_time) * 1000
+            last_time = now
             
-            # Process events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    self.control.handle_key_down(event.key, self.player_state)
-                elif event.type == pygame.KEYUP:
-                    self.control.handle_key_up(event.key, self.player_state)
+            # Catch the simulation up to real time. Each step stands for step_ms of wall time,
+            # the input that arrived during that time is handled right before it.
+            step_start = now - accumulator / 1000
+            steps = 0
+            while accumulator >= step_ms and steps < config.MAX_SIMULATION_STEPS:
+                step_end = step_start + step_ms / 1000
+                self.handle_events(self.input.take_until(step_end), step_start)
+                self.update()
+                accumulator -= step_ms
+                steps += 1
+                step_start = step_end
             
-            # Clear screen for next frame
-            self.display.clear_screen()
+            # Input since the last step belongs to the next one, but is handled now so it shows this frame
+            self.handle_events(self.input.take_until(now), step_start)
             
-            self.level.draw_level()
-            self.level.update_camera()
-            self.control.update()
-
-            self.display.draw_scene()
+            # After a long stall, drop the time we couldn't catch up on instead of running ever more steps
+            if steps == config.MAX_SIMULATION_STEPS:
+                accumulator = min(accumulator, step_ms)
             
-            if self.game_state == "menu":
-                self.ui.draw_menu()
+            # How far we are between the last simulation step and the next one
+            self.draw(accumulator / step_ms)
             
-            # Draw debug message if active
-            if config.DEBUG_TEXT_VISIBLE:
-                debug_msg = self.debug.get_current_message()
-                if debug_msg:
-                    self.display.draw_debug(debug_msg)
+            frames += 1
+            if self.stage_timer is not None:
+                self.stage_timer.end_frame()
+            if (self.max_frames and frames >= self.max_frames) or (end_time and time.perf_counter() >= end_time):
+                self.running = False
+        self.exit()
+    
+    def replay(self, recording):
+        """
+        Play a recording back: its key events are handled at the same simulation ticks,
+        one step and one frame at a time as fast as possible, then the final state
+        checksum is compared with the recorded one.
+        
+        Args:
+            recording (input_recording.Recording): Loaded with input_recording.load_recording
+        
+        Returns:
+            True if the replay ended in the recorded state
+        """
+        self.display.clear_screen()
+        self.step_ms = recording.step_ms
+        self.game_state = recording.game_state
+        self.state_checksum = 0
+        
+        events = recording.events
+        index = 0
+        start = time.perf_counter()
+        if self.stage_timer is not None:
+            self.stage_timer.reset()
+        
+        while self.tick < recording.ticks:
+            # Keep SDL's event queue drained, real input is ignored
+            pygame.event.pump()
+            while index < len(events) and events[index][0] <= self.tick:
+                tick, kind, key, offset = events[index]
+                self.handle_input(kind, key, offset)
+                index += 1
+            self.update()
+            self.draw(1.0)
+            if self.stage_timer is not None:
+                self.stage_timer.end_frame()
+        
+        seconds = time.perf_counter() - start
+        matched = self.state_checksum == recording.checksum
+        print(f"[Replay]: {recording.ticks} steps, {len(events)} key events in {seconds:.2f}s "
+              f"({recording.ticks * self.step_ms / 1000 / max(seconds, 1e-9):.1f}x real time)")
+        print("[Replay]: " + ("final state matches the recording" if matched else
+                              f"state diverged (checksum {self.state_checksum:08x}, recorded {recording.checksum:08x})"))
+        self.exit()
+        return matched
+    
+    def handle_events(self, events, step_start):
+        """
+        Handle sampled events in the order they arrived.
+        
+        Args:
+            events: (perf_counter time, event) pairs from the input sampler
+            step_start (float): perf_counter time where the coming simulation step's time begins
+        """
+        step_seconds = self.step_ms / 1000
+        for arrival, event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+                continue
+            if event.type == pygame.KEYDOWN:
+                if event.key == config.PROFILER_TOGGLE_KEY:
+                    self.profiler.toggle()
+                    continue
+                if event.key == config.TRACE_DUMP_KEY and self.tracer is not None:
+                    self.dump_trace()
+                    continue
+                kind = input_recording.KEY_DOWN
+            elif event.type == pygame.KEYUP:
+                kind = input_recording.KEY_UP
+            else:
+                continue
             
+            # How far into the step the event arrived (stalls can put it before or after)
+            offset = int((arrival - step_start) / step_seconds * input_recording.OFFSET_SCALE)
+            offset = max(0, min(input_recording.OFFSET_SCALE - 1, offset))
+            self.handle_input(kind, event.key, offset, arrival)
+    
+    def handle_input(self, kind, key, offset=0, arrival=None):
+        """
+        Pass a key event to Control, recording it first if a recording is running.
+        
+        Args:
+            kind: input_recording.KEY_DOWN or KEY_UP
+            offset (int): How far into the coming simulation step it happened, in 1/OFFSET_SCALE steps
+            arrival (float): perf_counter time the event arrived, for the latency stats (None in replays)
+        """
+        if self.recorder is not None:
+            self.recorder.record(self.tick, kind, key, offset)
+        self.latency.set_input_time(arrival)
+        if kind == input_recording.KEY_DOWN:
+            self.control.handle_key_down(key, self.player_state, self.get_time(offset))
+        else:
+            self.control.handle_key_up(key, self.player_state)
+    
+    def get_time(self, offset=0):
+        """
+        Simulation time in seconds. Game logic reads this instead of the wall clock,
+        so a replay makes the same decisions (e.g. double taps) at any speed.
+        
+        Args:
+            offset (int): Time into the coming step, in 1/input_recording.OFFSET_SCALE steps
+        """
+        return (self.tick + offset / input_recording.OFFSET_SCALE) * self.step_ms / 1000
+    
+    def get_state(self):
+        """The simulation state a replay has to reproduce"""
+        board = self.display.board_animation
+        return (self.level.camera_x, self.level.camera_y, self.player_state, self.display.current_trick,
+                board.frame if board is not None else -1, self.control.keys_held,
+                sorted(self.control.double_tapped_actions))
+    
+    def update(self):
+        """
+        Advance the simulation by one fixed step.
+        """
+        timer = self.get_stage_timer()
+        if timer:
+            timer.mark()
+        
+        self.level.update_camera()
+        if timer:
+            timer.lap("update_camera")
+        self.control.update()
+        if timer:
+            timer.lap("control.update")
+        self.display.animations.update(self.step_ms)
+        if timer:
+            timer.lap("animations")
+        
+        if self.game_state == "menu":
+            self.ui.update()
+        else:
+            self.ui.update_hud(self.control.keys_held, self.control.double_tapped_actions)
+        if timer:
+            timer.lap("ui.update")
+        
+        self.tick += 1
+        if self.state_checksum is not None:
+            self.state_checksum = zlib.crc32(repr(self.get_state()).encode(), self.state_checksum)
+    
+    def draw(self, alpha=1.0):
+        """
+        Render one frame. alpha (0-1) is how far between the previous and the latest
+        simulation step to draw moving things, so motion stays smooth at any frame rate.
+        """
+        timer = self.get_stage_timer()
+        if timer:
+            timer.mark()
+        
+        # Clear screen for next frame (the scrolling level covers the whole screen itself)
+        if config.LEVEL_RENDER_MODE != "scroll":
+            self.display.clear_screen()
+        
+        self.level.draw_level(alpha)
+        if timer:
+            timer.lap("draw_level")
+
+        self.display.draw_scene()
+        if timer:
+            timer.lap("draw_scene")
+        
+        if self.game_state == "menu":
+            self.ui.draw_menu()
+            if timer:
+                timer.lap("ui.draw_menu")
+        else:
+            self.ui.draw_hud()
+            if timer:
+                timer.lap("ui.draw_hud")
+        
+        # Draw debug message if active
+        if config.DEBUG_TEXT_VISIBLE:
+            debug_msg = self.debug.get_current_message()
+            if debug_msg:
+                self.display.draw_debug(debug_msg)
+        
+        if self.profiler.show_overlay:
+            self.display.draw_profiler()
+        if timer:
+            timer.lap("debug_overlay")
+        
+        if self.present:
             pygame.display.update()
-        self.exit()
+            if timer:
+                timer.lap("present")
+        
+        # Whatever this frame shows is now on screen
+        self.latency.presented()
         
+    def get_stage_timer(self):
+        """The headless run's timer, else the profiler while it is on, else None (nothing timed)"""
+        if self.stage_timer is not None:
+            return self.stage_timer
+        if self.profiler.enabled:
+            return self.profiler
+        return None
+    
+    def dump_trace(self):
+        path = self.tracer.dump(config.TRACE_PATH)
+        self.debug.info("Trace saved to %s", path)
+    
+    def save_atlas_if_stale(self):
+        if config.USE_TEXTURE_ATLAS and self.assets.atlas_stale:
+            self.assets.build_atlas(config.ATLAS_CACHE_PATH)
+    
     def exit(self):
+        if self.exited:
+            return
+        self.exited = True
+        
+        # Images first requested while playing (e.g. scaled menu icons) get packed for next launch
+        self.save_atlas_if_stale()
+        if self.tracer is not None:
+            print(f"Trace saved to {self.tracer.dump(config.TRACE_PATH)}")
+        latency_path = self.latency.export(config.LATENCY_PATH)
+        if latency_path is not None:
+            print(f"Input latency saved to {latency_path}")
+        if self.recorder is not None:
+            print(f"Input recording saved to {self.recorder.close(self.tick, self.state_checksum)}")
+            self.recorder = None
         self.running = False
+        self.level.shutdown()
+        self.display.rotation_frames.stop()
+        self.sounds.stop()
         pygame.quit()
+        
+        if self.stage_timer is not None:
+            for line in self.stage_timer.format_report():
+                print("[Timing]: " + line)
+        
+        # Last, so everything logged while shutting down is written
+        self.debug.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Super-Sk8!")
+    parser.add_argument("--headless", action="store_true", default=config.HEADLESS,
+                        help="Run without a window, uncapped, and print stage timings at exit")
+    parser.add_argument("--frames", type=int, default=config.HEADLESS_FRAMES, help="Stop after this many frames")
+    parser.add_argument("--duration", type=float, default=config.HEADLESS_DURATION, help="Stop after this many seconds")
+    parser.add_argument("--present", action="store_true", default=None,
+                        help="Call pygame.display.update even when headless")
+    parser.add_argument("--record", metavar="FILE", default=config.RECORDING_PATH if config.RECORD_INPUT else None,
+                        help="Record the key events to FILE (or a folder) for --replay")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="Play a recording back headlessly as fast as possible and check the final state")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    main = Main()
+    args = parse_args()
+    recording = input_recording.load_recording(args.replay) if args.replay else None
+    main = Main(args.headless or recording is not None, args.frames, args.duration, args.present,
+                None if recording is not None else args.record)
     
     try:
-        main.run()
+        if recording is not None:
+            main.replay(recording)
+        else:
+            main.run()
     except Exception as e:
-        print(e)
+        main.debug.error("%s", e)
         
     main.exit()
     print("Game exited")
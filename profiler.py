@@ -0,0 +1,104 @@
+"""Frame profiler module."""
+
+import collections
+import time
+import stage_timer
+
+# Upper edges of the histogram buckets in milliseconds (the last bucket takes everything above)
+HISTOGRAM_EDGES = (0.25, 0.5, 1, 2, 4, 8, 16)
+
+
+class Profiler:
+    """
+    Rolling timings of named spans (main loop stages and work inside the subsystems).
+    Each span keeps its last `window` samples, so the stats and histograms follow what
+    the game is doing now rather than averaging over the whole session.
+
+    Callers check `enabled` before timing anything, so a disabled profiler costs one
+    attribute lookup per span:
+
+        start = profiler.begin() if profiler.enabled else None
+        ...
+        if start is not None:
+            profiler.end("level.bake_chunk", start)
+
+    begin/end carry no shared state, so spans can also be timed on worker threads.
+
+    Spans go to the rolling stats while the overlay is shown, and to the tracer
+    (see tracer.py) if one is attached. `enabled` is True while either wants them.
+    """
+    def __init__(self, enabled=False, window=240, tracer=None):
+        self.show_overlay = enabled
+        self.window = window
+        self.tracer = tracer
+        self.enabled = enabled or tracer is not None
+        self.samples = {}  # Dictionary: span name -> deque of the latest durations in milliseconds
+        self.last = 0.0
+
+    def toggle(self):
+        """Turn the overlay stats on or off. Samples are cleared so the stats start fresh."""
+        self.show_overlay = not self.show_overlay
+        self.enabled = self.show_overlay or self.tracer is not None
+        self.samples = {}
+
+    def begin(self):
+        return time.perf_counter()
+
+    def end(self, name, start, detail=None):
+        """
+        Args:
+            detail (str): Optional extra information for the trace, e.g. the trick name
+        """
+        now = time.perf_counter()
+        if self.show_overlay:
+            self.add(name, (now - start) * 1000)
+        if self.tracer is not None:
+            self.tracer.span(name, start, now, detail)
+
+    def instant(self, name, detail=None):
+        """Mark a point in time in the trace (instant events don't appear in the overlay)"""
+        if self.tracer is not None:
+            self.tracer.instant(name, detail)
+
+    def add(self, name, duration):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples.setdefault(name, collections.deque(maxlen=self.window))
+        samples.append(duration)
+
+    def mark(self):
+        """Same interface as StageTimer, for the main loop stages"""
+        self.last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        if self.show_overlay:
+            self.add(name, (now - self.last) * 1000)
+        if self.tracer is not None:
+            self.tracer.span(name, self.last, now)
+        self.last = now
+
+    def get_stats(self, name):
+        """
+        Returns:
+            Dictionary with "mean", "p95", "max" and "last" in milliseconds, plus "count"
+        """
+        samples = list(self.samples[name])
+        ordered = sorted(samples)
+        return {
+            "count": len(samples),
+            "mean": sum(samples) / len(samples),
+            "p95": stage_timer.get_percentile(ordered, 95),
+            "max": ordered[-1],
+            "last": samples[-1],
+        }
+
+    def get_histogram(self, name):
+        """Count of samples in each HISTOGRAM_EDGES bucket (plus one for slower ones)"""
+        counts = [0] * (len(HISTOGRAM_EDGES) + 1)
+        for duration in list(self.samples[name]):
+            counts[stage_timer.get_histogram_bucket(HISTOGRAM_EDGES, duration)] += 1
+        return counts
+
+    def get_names(self):
+        return list(self.samples)
@@ -0,0 +1,182 @@
+"""Board rotation frame store module."""
+
+import collections
+import queue
+import threading
+import pygame
+import trick_compiler
+import config
+
+
+class RotationFrameStore:
+    """
+    Serves the board render closest to any (flip, shuv) angle pair.
+    Renders are decoded and scaled the first time they are asked for and kept in an
+    LRU bounded by estimated bytes, so only recently shown angles stay in memory.
+    Likely next angles can be decoded ahead of time on a background thread (started by
+    the first prefetch); those count towards the same byte limit and are dropped first,
+    oldest first.
+    """
+    def __init__(self, assets, zoom, max_bytes, frames_path=config.BOARD_ROTATION_FRAMES_PATH, prefetch=True,
+                 debug=None):
+        self.assets = assets
+        self.debug = debug
+        self.zoom = zoom
+        self.max_bytes = max_bytes
+        self.frames_path = frames_path
+
+        self.frames = collections.OrderedDict()  # (flip, shuv) -> surface, oldest first
+        self.total_bytes = 0
+
+        # Counters for tuning the memory limit
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Background decoding of frames we expect to need soon
+        self.prefetched = collections.OrderedDict()  # (flip, shuv, zoom) -> decoded surface, not yet display-converted
+        self.prefetched_bytes = 0
+        self.prefetch_pending = set()
+        self.prefetch_lock = threading.Lock()
+        self.prefetch_enabled = prefetch
+        self.prefetch_queue = None  # Created with the thread on the first prefetch
+        self.thread = None
+
+    def get_nearest_angles(self, flip, shuv):
+        """
+        Snap an angle pair to the 10 degree grid of the renders.
+        Flip wraps at 360, shuv at 180 (the board looks the same turned 180 degrees).
+        """
+        return (int(round(flip / 10)) * 10) % 360, (int(round(shuv / 10)) * 10) % 180
+
+    def get_path(self, angles):
+        return trick_compiler.get_rotation_frame_path(angles[0], angles[1], self.frames_path)
+
+    def get_frame(self, flip, shuv):
+        """Return the scaled render nearest to (flip, shuv), decoding it if needed"""
+        angles = self.get_nearest_angles(flip, shuv)
+        frame = self.frames.get(angles)
+        if frame is not None:
+            self.hits += 1
+            self.frames.move_to_end(angles)
+            return frame
+
+        self.misses += 1
+        with self.prefetch_lock:
+            frame = self.prefetched.pop((angles[0], angles[1], self.zoom), None)
+            if frame is not None:
+                self.prefetched_bytes -= self.assets.get_surface_bytes(frame)
+        if frame is not None:
+            frame = self.assets.convert(frame)
+        else:
+            frame = self.assets.decode(self.get_path(angles), self.zoom)
+
+        self.frames[angles] = frame
+        self.total_bytes += self.assets.get_surface_bytes(frame)
+        self.evict()
+        return frame
+
+    def evict(self):
+        """
+        Drop prefetched frames, then least recently used frames, until under the
+        memory limit (always keeps the newest frame).
+        """
+        with self.prefetch_lock:
+            self.evict_prefetched()
+        while self.total_bytes + self.prefetched_bytes > self.max_bytes and len(self.frames) > 1:
+            angles, frame = self.frames.popitem(last=False)
+            self.total_bytes -= self.assets.get_surface_bytes(frame)
+            self.evictions += 1
+
+    def evict_prefetched(self, keep=0):
+        """Drop the oldest prefetched frames while over the memory limit. Call with prefetch_lock held."""
+        while self.total_bytes + self.prefetched_bytes > self.max_bytes and len(self.prefetched) > keep:
+            key, frame = self.prefetched.popitem(last=False)
+            self.prefetched_bytes -= self.assets.get_surface_bytes(frame)
+            self.evictions += 1
+
+    def prefetch(self, flip, shuv):
+        """Ask the background thread to decode a frame we will probably show soon"""
+        if not self.prefetch_enabled:
+            return
+        angles = self.get_nearest_angles(flip, shuv)
+        key = (angles[0], angles[1], self.zoom)
+        if angles in self.frames or key in self.prefetch_pending:
+            return
+        with self.prefetch_lock:
+            if key in self.prefetched:
+                return
+            self.prefetch_pending.add(key)
+        if self.prefetch_queue is None:
+            self.prefetch_queue = queue.Queue()
+            self.thread = threading.Thread(target=self.prefetch_worker, name="RotationFramePrefetch", daemon=True)
+            self.thread.start()
+        self.prefetch_queue.put(key)
+
+    def prefetch_ahead(self, flip, shuv, flip_speed, shuv_speed, count=2):
+        """
+        Prefetch the frames the board will reach in the next few steps at its current rotation speed.
+
+        Args:
+            flip_speed, shuv_speed: Degrees the board turns per step
+            count: How many steps ahead to prefetch
+        """
+        for step in range(1, count + 1):
+            self.prefetch(flip + flip_speed * step, shuv + shuv_speed * step)
+
+    def prefetch_worker(self):
+        while True:
+            key = self.prefetch_queue.get()
+            if key is None:
+                break
+            flip, shuv, zoom = key
+            path = self.get_path((flip, shuv))
+            try:
+                # Decoded without display conversion, get_frame converts on the main thread
+                frame = self.assets.decode(path, zoom, convert=False)
+            except (OSError, pygame.error) as error:
+                # Not fatal: get_frame decodes it on demand if it is ever shown
+                with self.prefetch_lock:
+                    self.prefetch_pending.discard(key)
+                if self.debug is not None:
+                    self.debug.warning("Could not prefetch board render %s: %s", path, error)
+                continue
+            with self.prefetch_lock:
+                self.prefetch_pending.discard(key)
+                # Requested before a zoom change, nothing will ask for it any more
+                if zoom != self.zoom or key in self.prefetched:
+                    continue
+                self.prefetched[key] = frame
+                self.prefetched_bytes += self.assets.get_surface_bytes(frame)
+                # Keep the frame just decoded, it is the one most likely to be shown next
+                self.evict_prefetched(keep=1)
+
+    def set_zoom(self, zoom):
+        """Frames are scaled for the zoom, so changing it empties the store"""
+        self.zoom = zoom
+        self.clear()
+
+    def clear(self):
+        self.frames.clear()
+        self.total_bytes = 0
+        with self.prefetch_lock:
+            self.prefetched.clear()
+            self.prefetched_bytes = 0
+            self.prefetch_pending.clear()
+
+    def stop(self):
+        self.prefetch_enabled = False
+        if self.prefetch_queue is not None:
+            self.prefetch_queue.put(None)
+            self.prefetch_queue = None
+
+    def get_stats(self):
+        return {
+            "frames": len(self.frames),
+            "bytes": self.total_bytes,
+            "prefetched": len(self.prefetched),
+            "prefetched_bytes": self.prefetched_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,107 @@
+"""Sound bank module."""
+
+import os
+import pygame
+
+
+class SoundBank:
+    """
+    Decodes every sound effect once and plays them on reserved mixer channels.
+
+    Each category (e.g. "pop", "land") has a file prefix whose numbered variants
+    (SFX/Pop_1.wav, SFX/Pop_2.wav...) are found case-insensitively, and a voice limit:
+    the category owns that many channels, so spamming one sound can never take
+    channels from the others. When all of a category's voices are busy, the one
+    that started first is cut off. Variants are played in turn (round robin).
+    """
+    def __init__(self, paths, voices, volume=1.0, preload=True):
+        """
+        Args:
+            paths (dict): Category -> file prefix, e.g. "SFX/Pop_"
+            voices (dict): Category -> number of sounds it may play at once
+            volume (float): Volume for every sound
+            preload (bool): Decode every variant now instead of on first play
+        """
+        self.paths = paths
+        self.volume = volume
+        self.enabled = pygame.mixer.get_init() is not None  # No audio device, nothing to play on
+
+        self.variant_paths = {category: self.find_variants(prefix) for category, prefix in paths.items()}
+        self.sounds = {}  # Dictionary: category -> list of Sound (None until loaded)
+        self.next_variant = {category: 0 for category in paths}
+
+        # Split a block of reserved channels between the categories
+        self.channels = {}  # Dictionary: category -> list of Channel
+        self.channel_started = {}  # Dictionary: Channel -> tick it last started playing
+        if self.enabled:
+            total = sum(voices.get(category, 1) for category in paths)
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total + 1))
+            pygame.mixer.set_reserved(total)
+            index = 0
+            for category in paths:
+                count = voices.get(category, 1)
+                self.channels[category] = [pygame.mixer.Channel(index + offset) for offset in range(count)]
+                index += count
+
+        for category in paths:
+            self.sounds[category] = [None] * len(self.variant_paths[category])
+            if preload and self.enabled:
+                for variant in range(len(self.sounds[category])):
+                    self.get_sound(category, variant)
+
+    def find_variants(self, prefix):
+        """
+        Return the files starting with prefix, matched case-insensitively (the file
+        system may be case sensitive), sorted by their number.
+        """
+        folder, name = os.path.split(prefix)
+        name = name.lower()
+        variants = []
+        for filename in os.listdir(folder or "."):
+            stem, extension = os.path.splitext(filename)
+            if extension.lower() == ".wav" and stem.lower().startswith(name):
+                number = stem[len(name):]
+                variants.append((int(number) if number.isdigit() else 0, os.path.join(folder, filename)))
+        return [path for number, path in sorted(variants)]
+
+    def get_sound(self, category, variant):
+        """Return a variant's Sound, decoding it on first use"""
+        sound = self.sounds[category][variant]
+        if sound is None:
+            sound = pygame.mixer.Sound(self.variant_paths[category][variant])
+            sound.set_volume(self.volume)
+            self.sounds[category][variant] = sound
+        return sound
+
+    def play(self, category):
+        """
+        Play the next variant of a category on one of its channels.
+
+        Returns:
+            Path of the variant played, or None if nothing was played
+        """
+        if not self.enabled or not self.sounds.get(category):
+            return None
+
+        variant = self.next_variant[category]
+        self.next_variant[category] = (variant + 1) % len(self.sounds[category])
+        sound = self.get_sound(category, variant)
+
+        channel = self.get_free_channel(category)
+        channel.play(sound)
+        self.channel_started[channel] = pygame.time.get_ticks()
+        return self.variant_paths[category][variant]
+
+    def get_free_channel(self, category):
+        """An idle channel of the category, or else the one that has been playing longest"""
+        channels = self.channels[category]
+        for channel in channels:
+            if not channel.get_busy():
+                return channel
+        return min(channels, key=lambda channel: self.channel_started.get(channel, 0))
+
+    def stop(self):
+        """Silence every channel of the bank"""
+        for channels in self.channels.values():
+            for channel in channels:
+                channel.stop()
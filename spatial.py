@@ -0,0 +1,85 @@
+"""Spatial index module."""
+
+import pygame
+
+
+class SpatialGrid:
+    """
+    Uniform grid over world-space rectangles.
+    Each item is stored in every cell its bounds touch, so a query only looks at
+    the cells under the requested area instead of every item that exists.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}  # Dictionary: (cell_x, cell_y) -> set of item keys
+        self.items = {}  # Dictionary: item key -> (rect, depth, cells)
+
+    def _cells_for_rect(self, rect):
+        """Return the grid cells covered by a rect."""
+        size = self.cell_size
+        first_x = rect.left // size
+        first_y = rect.top // size
+        last_x = (rect.right - 1) // size
+        last_y = (rect.bottom - 1) // size
+        return [(cell_x, cell_y)
+                for cell_x in range(first_x, last_x + 1)
+                for cell_y in range(first_y, last_y + 1)]
+
+    def insert(self, key, rect, depth=0):
+        """
+        Add (or move) an item.
+
+        Args:
+            key: Any hashable id for the item
+            rect: World-space bounds of the item
+            depth: Draw order, query results are sorted back to front by it
+        """
+        if key in self.items:
+            self.remove(key)
+
+        rect = pygame.Rect(rect)
+        cells = self._cells_for_rect(rect)
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(key)
+        self.items[key] = (rect, depth, cells)
+
+    def remove(self, key):
+        """Remove an item if it is in the grid."""
+        item = self.items.pop(key, None)
+        if item is None:
+            return
+
+        for cell in item[2]:
+            bucket = self.cells[cell]
+            bucket.discard(key)
+            if not bucket:
+                del self.cells[cell]
+
+    def clear(self):
+        self.cells = {}
+        self.items = {}
+
+    def get_rect(self, key):
+        return self.items[key][0]
+
+    def query(self, rect):
+        """
+        Return the keys of every item overlapping rect, sorted by depth.
+        """
+        rect = pygame.Rect(rect)
+        found = set()
+        for cell in self._cells_for_rect(rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+
+        items = self.items
+        hits = [key for key in found if items[key][0].colliderect(rect)]
+        hits.sort(key=lambda key: items[key][1])
+        return hits
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
@@ -0,0 +1,105 @@
+"""Stage timing module."""
+
+import bisect
+import math
+import time
+from array import array
+
+
+def get_histogram_bucket(edges, value):
+    """Index of the first bucket whose upper edge is >= value (len(edges) if above them all)"""
+    return bisect.bisect_left(edges, value)
+
+
+def get_percentile(sorted_samples, percent):
+    """
+    Nearest-rank percentile of an already sorted sequence: the smallest sample with at
+    least percent% of the samples at or below it.
+
+    >>> get_percentile([1, 2, 3, 4, 5], 50)
+    3
+    >>> get_percentile(list(range(1, 31)), 95)
+    29
+    >>> get_percentile(list(range(1, 21)), 95)
+    19
+    >>> get_percentile([1, 2, 3, 4], 100), get_percentile([1, 2, 3, 4], 0)
+    (4, 1)
+    """
+    if not sorted_samples:
+        return 0.0
+    # percent * n first, so whole-number ranks stay exact (95 / 100 * 20 would round up to rank 20)
+    index = max(0, math.ceil(percent * len(sorted_samples) / 100) - 1)
+    return sorted_samples[index]
+
+
+class StageTimer:
+    """
+    Records how long each stage of the main loop takes, for the headless report.
+    Call mark() before the first stage, then lap(name) after each one: a lap is the
+    time since the previous mark or lap.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget everything recorded so far, e.g. to leave startup out of the report"""
+        self.samples = {}  # Dictionary: stage name -> array of milliseconds, in call order
+        self.frame_times = array("d")
+        self.last = time.perf_counter()
+        self.frame_start = self.last
+        self.start_time = self.last
+
+    def mark(self):
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        samples = self.samples.get(stage)
+        if samples is None:
+            samples = self.samples[stage] = array("d")
+        samples.append((now - self.last) * 1000)
+        self.last = now
+
+    def end_frame(self):
+        """Record the whole frame (simulation steps plus drawing) since the previous end_frame"""
+        now = time.perf_counter()
+        self.frame_times.append((now - self.frame_start) * 1000)
+        self.frame_start = now
+
+    def get_report(self):
+        """
+        Returns:
+            Dictionary with "frames", "seconds", "fps", "frame" (percentiles of whole frames)
+            and "stages": stage name -> {"calls", "mean", "p50", "p95", "p99", "max"} in milliseconds
+        """
+        seconds = time.perf_counter() - self.start_time
+        report = {
+            "frames": len(self.frame_times),
+            "seconds": seconds,
+            "fps": len(self.frame_times) / seconds if seconds > 0 else 0.0,
+            "frame": self.summarize(self.frame_times),
+            "stages": {stage: self.summarize(samples) for stage, samples in self.samples.items()},
+        }
+        return report
+
+    def summarize(self, samples):
+        ordered = sorted(samples)
+        return {
+            "calls": len(ordered),
+            "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+            "p50": get_percentile(ordered, 50),
+            "p95": get_percentile(ordered, 95),
+            "p99": get_percentile(ordered, 99),
+            "max": ordered[-1] if ordered else 0.0,
+        }
+
+    def format_report(self):
+        """Return the report as printable lines"""
+        report = self.get_report()
+        lines = [f"{report['frames']} frames in {report['seconds']:.2f}s, {report['fps']:.1f} FPS"]
+        rows = [("frame", report["frame"])] + list(report["stages"].items())
+        lines.append(f"{'stage':<16}{'calls':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+        for stage, stats in rows:
+            lines.append(f"{stage:<16}{stats['calls']:>8}{stats['mean']:>9.3f}{stats['p50']:>9.3f}"
+                         f"{stats['p95']:>9.3f}{stats['p99']:>9.3f}{stats['max']:>9.3f}")
+        return lines
@@ -0,0 +1,120 @@
+"""Trace recording module."""
+
+import json
+import os
+import threading
+import time
+from array import array
+
+
+class Tracer:
+    """
+    Records spans and instant events into a fixed-size ring buffer and writes them
+    out as Chrome trace-event JSON (open in chrome://tracing or ui.perfetto.dev).
+
+    The buffer is a set of preallocated arrays, so recording only overwrites numbers:
+    names and details are stored as ids into a table that grows once per distinct string.
+    When the buffer is full the oldest events are overwritten, so memory stays
+    bounded however long the session runs.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0  # Events recorded so far (the write position is count % capacity)
+
+        # One slot per event, in parallel arrays
+        self.timestamps = array("d", bytes(8 * capacity))  # Seconds (perf_counter)
+        self.durations = array("d", bytes(8 * capacity))  # Seconds, -1 for instant events
+        self.name_ids = array("l", bytes(array("l").itemsize * capacity))
+        self.detail_ids = array("l", bytes(array("l").itemsize * capacity))  # -1 = no detail
+        self.thread_ids = array("Q", bytes(8 * capacity))
+
+        self.strings = []  # Id -> string for names and details
+        self.string_ids = {}  # String -> id
+        self.thread_names = {}  # Thread ident -> thread name
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+
+    def get_string_id(self, text):
+        """Caller must hold self.lock, the chunk loader thread records too"""
+        string_id = self.string_ids.get(text)
+        if string_id is None:
+            string_id = self.string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def record(self, name, start, duration, detail=None):
+        thread_id = threading.get_ident()
+
+        with self.lock:
+            if thread_id not in self.thread_names:
+                self.thread_names[thread_id] = threading.current_thread().name
+            name_id = self.get_string_id(name)
+            detail_id = -1 if detail is None else self.get_string_id(detail)
+            index = self.count % self.capacity
+            self.count += 1
+            self.timestamps[index] = start
+            self.durations[index] = duration
+            self.name_ids[index] = name_id
+            self.detail_ids[index] = detail_id
+            self.thread_ids[index] = thread_id
+
+    def span(self, name, start, end, detail=None):
+        """Record a span that ran from start to end (perf_counter seconds)"""
+        self.record(name, start, end - start, detail)
+
+    def instant(self, name, detail=None):
+        """Record a point in time, e.g. a sound being played"""
+        self.record(name, time.perf_counter(), -1.0, detail)
+
+    def get_events(self):
+        """Return the recorded events, oldest first, as Chrome trace-event dictionaries"""
+        # Copy everything under the lock so events recorded meanwhile can't overwrite slots being read
+        with self.lock:
+            count = self.count
+            timestamps = self.timestamps[:]
+            durations = self.durations[:]
+            name_ids = self.name_ids[:]
+            detail_ids = self.detail_ids[:]
+            thread_ids = self.thread_ids[:]
+            strings = list(self.strings)
+            thread_names = dict(self.thread_names)
+        first = max(0, count - self.capacity)
+
+        events = []
+        for event_number in range(first, count):
+            index = event_number % self.capacity
+            event = {
+                "name": strings[name_ids[index]],
+                "pid": 1,
+                "tid": thread_ids[index],
+                "ts": (timestamps[index] - self.origin) * 1e6,  # Microseconds
+            }
+            if durations[index] < 0:
+                event["ph"] = "i"
+                event["s"] = "t"  # Instant event scoped to its thread
+            else:
+                event["ph"] = "X"
+                event["dur"] = durations[index] * 1e6
+            if detail_ids[index] >= 0:
+                event["args"] = {"detail": strings[detail_ids[index]]}
+            events.append(event)
+
+        for thread_id, thread_name in thread_names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": thread_id, "args": {"name": thread_name}})
+        return events
+
+    def dump(self, folder):
+        """
+        Write the buffer to a new trace file in folder.
+
+        Returns:
+            Path of the written file
+        """
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, time.strftime("trace-%Y%m%d-%H%M%S") + f"-{self.count}.json")
+        with open(path, "w") as file:
+            json.dump({"traceEvents": self.get_events(), "displayTimeUnit": "ms"}, file)
+        return path
+
+    def __len__(self):
+        return min(self.count, self.capacity)
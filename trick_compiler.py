@@ -0,0 +1,145 @@
+"""
+Trick compiler module.
+
+Turns the trick definitions in config.FLIP_CONTROLS (total flip, total shuv, frame
+count) into the sequence of board rotation renders each trick shows. Sequences are
+cached on disk per trick, keyed by a hash of its definition, so only new or edited
+tricks are recompiled.
+"""
+
+import hashlib
+import json
+import os
+import config
+
+COMPILER_VERSION = 1
+
+# The renders cover flip 0-350 and shuv 0-170 in 10 degree steps
+FLIP_STEPS = 36
+SHUV_STEPS = 18
+
+
+def get_trick_definitions(controls=None):
+    """
+    Returns:
+        Dictionary: trick name -> [flip_total, shuv_total, frames] for every trick with rotation parameters
+    """
+    if controls is None:
+        controls = config.FLIP_CONTROLS
+    return {name: [entry["flip"], entry["shuv"], entry.get("frames", config.TRICK_FRAME_COUNT)]
+            for name, entry in controls.items() if "flip" in entry and "shuv" in entry}
+
+
+def get_frame_index(flip, shuv):
+    """Index of a render in the flip-major grid of renders"""
+    return (flip % 360) // 10 * SHUV_STEPS + (shuv % 180) // 10
+
+
+def get_frame_angles(index):
+    """(flip, shuv) of a render index, as used in the render file names"""
+    return index // SHUV_STEPS * 10, index % SHUV_STEPS * 10
+
+
+def get_rotation_frame_path(flip, shuv, frames_path=config.BOARD_ROTATION_FRAMES_PATH):
+    """Return the render for an angle pair (the resting board has no render, Default.png is used)"""
+    path = os.path.join(frames_path, f"flip{flip}_shuv{shuv}.png")
+    if not os.path.exists(path) and flip == 0 and shuv == 0:
+        return config.BOARD_REST_FRAME_PATH
+    return path
+
+
+def get_frame_paths(indices, frames_path=config.BOARD_ROTATION_FRAMES_PATH):
+    """Resolve a compiled sequence to render file paths"""
+    return [get_rotation_frame_path(*get_frame_angles(index), frames_path) for index in indices]
+
+
+def compile_frame_indices(definitions):
+    """
+    Work out which render every frame of every trick shows. All frames of all tricks
+    are flattened into columns first, so each step of the math runs once over the lot.
+
+    Args:
+        definitions (dict): trick name -> [flip_total, shuv_total, frames]
+            flip_total: 360 = full flip, 0 = no flip, negative = other direction
+            shuv_total: 180 = half rotation, -180 = reverse, 360 = full rotation
+
+    Returns:
+        Dictionary: trick name -> list of render indices (see get_frame_angles)
+    """
+    flip_totals, shuv_totals, frame_numbers, frame_counts = [], [], [], []
+    for flip_total, shuv_total, total_frames in definitions.values():
+        flip_totals += [flip_total] * total_frames
+        shuv_totals += [shuv_total] * total_frames
+        frame_numbers += range(total_frames)
+        frame_counts += [total_frames] * total_frames
+
+    progress = [frame / (count - 1) if count > 1 else 0 for frame, count in zip(frame_numbers, frame_counts)]
+
+    # Flip advances in 10 degree steps
+    flips = [min(int(abs(total) // 10 * p), abs(total) // 10) * 10 for total, p in zip(flip_totals, progress)]
+    # For 360-degree shuvs, invert flip direction halfway through (when shuv reaches 180)
+    flips = [total - flip if abs(shuv) == 360 and p >= 0.5 else flip
+             for flip, total, shuv, p in zip(flips, flip_totals, shuv_totals, progress)]
+    flips = [-flip if total < 0 else flip for flip, total in zip(flips, flip_totals)]
+
+    # The renders only cover 0-170 degrees of shuv (the board is symmetric), so a 360 shuv
+    # cycles through them twice in 20 degree steps and a 180 shuv stops at 170
+    shuvs = [int((count - 1) * p) * 20 if abs(total) == 360 else min(int(abs(total) // 10 * p), 17) * 10
+             for total, count, p in zip(shuv_totals, frame_counts, progress)]
+    shuvs = [-shuv if total < 0 else shuv for shuv, total in zip(shuvs, shuv_totals)]
+
+    # Negative rotations go backwards through the renders: -10 flip -> 350, -10 shuv -> 170
+    indices = [get_frame_index(flip, shuv) for flip, shuv in zip(flips, shuvs)]
+
+    sequences = {}
+    start = 0
+    for name, (flip_total, shuv_total, total_frames) in definitions.items():
+        sequences[name] = indices[start:start + total_frames]
+        start += total_frames
+    return sequences
+
+
+def hash_definition(definition):
+    return hashlib.sha1(json.dumps([COMPILER_VERSION] + list(definition)).encode()).hexdigest()
+
+
+def load_cache(cache_path):
+    """Return the cached sequences (trick name -> {"hash", "frames"}), empty if missing or unreadable"""
+    try:
+        with open(cache_path) as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != COMPILER_VERSION:
+        return {}
+    return cache.get("tricks", {})
+
+
+def compile_tricks(definitions=None, cache_path=config.COMPILED_TRICKS_PATH):
+    """
+    Return the render sequence of every trick, compiling only the ones whose definition
+    isn't in the cache.
+
+    Returns:
+        Dictionary: trick name -> list of render indices
+    """
+    if definitions is None:
+        definitions = get_trick_definitions()
+
+    cached = load_cache(cache_path)
+    hashes = {name: hash_definition(definition) for name, definition in definitions.items()}
+    stale = {name: definition for name, definition in definitions.items()
+             if cached.get(name, {}).get("hash") != hashes[name]}
+
+    compiled = compile_frame_indices(stale) if stale else {}
+    sequences = {name: compiled[name] if name in compiled else cached[name]["frames"] for name in definitions}
+
+    if stale or set(cached) != set(definitions):
+        tricks = {name: {"hash": hashes[name], "frames": sequences[name]} for name in definitions}
+        try:
+            os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+            with open(cache_path, "w") as file:
+                json.dump({"version": COMPILER_VERSION, "tricks": tricks}, file)
+        except OSError:
+            pass  # Still usable, it just compiles again next launch
+    return sequences
@@ -1,95 +1,232 @@
 """UI module."""
 
 import pygame
+import config
+
+
+class Widget:
+    """
+    A pre-rendered surface placed on screen. The surface is only rebuilt when what it
+    shows changes, so drawing a widget is a single blit.
+    """
+    def __init__(self, surface=None):
+        self.surface = surface
+        self.rect = pygame.Rect((0, 0), surface.get_size() if surface is not None else (0, 0))
+        self.visible = True
+
+    def set_surface(self, surface):
+        self.surface = surface
+        self.rect.size = surface.get_size()
+
+    def move_to(self, x, y):
+        self.rect.topleft = (x, y)
+
+    def draw(self, screen):
+        if self.visible and self.surface is not None:
+            screen.blit(self.surface, self.rect)
+
+
+class Label(Widget):
+    """Text that is only re-rendered when it changes"""
+    def __init__(self, font, color, text=""):
+        self.font = font
+        self.color = color
+        self.text = None
+        super().__init__()
+        self.set_text(text)
+
+    def set_text(self, text):
+        text = str(text)
+        if text != self.text:
+            self.text = text
+            self.set_surface(self.font.render(text, True, self.color))
+
+
+class ProgressBar(Widget):
+    """Horizontal bar, re-rendered only when the filled width changes by a whole pixel"""
+    def __init__(self, size, fill_color, background_color, border=2):
+        self.size = size
+        self.fill_color = fill_color
+        self.background_color = background_color
+        self.border = border
+        self.filled_width = None
+        super().__init__()
+        self.set_value(0.0)
+
+    def set_value(self, value):
+        """value: 0 (empty) to 1 (full)"""
+        inner_width = self.size[0] - self.border * 2
+        filled_width = int(inner_width * max(0.0, min(1.0, value)))
+        if filled_width == self.filled_width:
+            return
+        self.filled_width = filled_width
+
+        surface = pygame.Surface(self.size, pygame.SRCALPHA)
+        surface.fill(self.background_color)
+        if filled_width:
+            surface.fill(self.fill_color, (self.border, self.border, filled_width, self.size[1] - self.border * 2))
+        self.set_surface(surface)
+
+
+class HandIndicator(Widget):
+    """
+    Shows which direction one hand's keys are pushing (and whether it was double tapped).
+    Every state is rendered once up front, changing state just swaps the surface.
+    """
+    DIRECTIONS = ("up", "down", "left", "right")
+
+    def __init__(self, assets, size):
+        self.states = {(None, False): assets.load("icons/keyboard_arrows.png", "icons", size=size)}
+        for direction in self.DIRECTIONS:
+            arrow = assets.load(f"icons/keyboard_arrow_{direction}.png", "icons", size=size)
+            self.states[(direction, False)] = arrow
+            # The arrows are white, multiplying tints them
+            tinted = arrow.copy()
+            tinted.fill(config.COLORS['accent'], special_flags=pygame.BLEND_RGBA_MULT)
+            self.states[(direction, True)] = tinted
+        self.state = (None, False)
+        super().__init__(self.states[self.state])
+
+    def set_state(self, action, double_tapped=False):
+        """
+        Args:
+            action (str): Held action such as "left-up", or "none"
+            double_tapped (bool): Whether the held key was double tapped
+        """
+        direction = action.split("-", 1)[1] if action and action != "none" else None
+        state = (direction, double_tapped and direction is not None)
+        if state != self.state:
+            self.state = state
+            self.set_surface(self.states[state])
+
 
 class UI:
+    """
+    Retained-mode UI: widgets are built once with pre-scaled surfaces and laid out
+    once per screen size, so drawing the menu or HUD is a handful of blits.
+    """
     def __init__(self, display):
         self.display = display
-        self.button = pygame.image.load("icons/ButtonEmpty.png")
-        self.play_icon = pygame.image.load("icons/play.png")
-        self.settings_icon = pygame.image.load("icons/question.png")
+        self.assets = display.assets
+        self.button = self.assets.load("icons/ButtonEmpty.png", "icons")
+        self.play_icon = self.assets.load("icons/play.png", "icons")
+        self.settings_icon = self.assets.load("icons/question.png", "icons")
         self.bob_frame = 0
-        
-    def draw_menu(self):
-        """
-        Draws a pixel art style play button (light grey) and a settings button underneath.
-        Both are centered horizontally, with the settings button below the play button.
-        """       
-        
-        
-        screen = self.display.screen  # Assume display has the pygame surface as .screen
-        width, height = screen.get_size()
-        horizontal_center = width // 2
-        horizontal_offset = 400
 
+        # Size and space
+        self.button_scale = 4
+        self.vertical_spacing = 64  # Space between buttons in pixels (after scaling)
+        self.horizontal_offset = 400
+
+        # Menu
+        self.play_button = Widget(self.build_button("icons/play.png"))
+        self.settings_button = Widget(self.build_button("icons/question.png"))
+        self.menu_widgets = [self.play_button, self.settings_button]
+
+        # HUD
+        self.hud_font = pygame.font.Font(config.FONT_PATH, config.FONT_SIZE_MEDIUM)
+        self.progress_bar = ProgressBar((400, 14), config.COLORS['accent'], (0, 0, 0, 140))
+        self.score_label = Label(self.hud_font, config.COLORS['white'], "0")
+        self.left_hand = HandIndicator(self.assets, (64, 64))
+        self.right_hand = HandIndicator(self.assets, (64, 64))
+        self.hud_widgets = [self.progress_bar, self.score_label, self.left_hand, self.right_hand]
+
+        self.layout_size = None
+
+    def build_button(self, icon_path):
+        """
+        Pre-scale the button and its icon and combine them into one surface.
+        """
         button_width = self.button.get_width()
         button_height = self.button.get_height()
+        surface = self.assets.load("icons/ButtonEmpty.png", "icons",
+                                   size=(button_width * self.button_scale, button_height * self.button_scale)).copy()
+        scaled_button_height = surface.get_height()
 
-        play_button = self.button.copy()
-        settings_button = self.button.copy()
-        play_button_icon = self.play_icon.copy()
-        settings_button_icon = self.settings_icon.copy()
-        # Size and space
-        button_scale = 4
-        vertical_spacing = 64  # Space between buttons in pixels (after scaling)
+        #Scale the icons according to the button height (because the icons are 1:1 ratio)
+        #Icons are also slightly scaled down to fit inside button better
+        icon_size = (button_height * self.button_scale * 0.9, button_height * self.button_scale * 0.9)
+        scaled_icon = self.assets.load(icon_path, "icons", size=icon_size)
+
+        #Icons sit half a button height in from the left, centered vertically
+        surface.blit(scaled_icon, (scaled_button_height // 2, scaled_button_height // 2 - scaled_icon.get_height() // 2))
+        return surface
+
+    def layout(self, width, height):
+        """
+        Position every widget for a screen size. Only runs when the size changes.
+        """
+        self.layout_size = (width, height)
+        horizontal_center = width // 2
+
+        # Menu buttons centered horizontally (shifted right), stacked around the vertical center
+        button_width, button_height = self.play_button.rect.size
+        self.menu_x = horizontal_center - button_width // 2 + self.horizontal_offset
+        total_height = (button_height * 2) + self.vertical_spacing
+        self.menu_y = height // 2 - total_height // 2
 
-        # Rescale buttons
-        play_button = pygame.transform.scale(play_button, (button_width * button_scale, button_height * button_scale))
-        settings_button = pygame.transform.scale(settings_button, (button_width * button_scale, button_height * button_scale))
-        scaled_button_width = play_button.get_width()
-        scaled_button_height = play_button.get_height()
+        # HUD: progress along the top, score top right, one hand indicator in each bottom corner
+        margin = 20
+        self.progress_bar.move_to(horizontal_center - self.progress_bar.rect.width // 2, margin)
+        self.score_layout = (width - margin, margin)
+        self.left_hand.move_to(margin, height - margin - self.left_hand.rect.height)
+        self.right_hand.move_to(width - margin - self.right_hand.rect.width, height - margin - self.right_hand.rect.height)
 
+    def check_layout(self):
+        size = self.display.screen.get_size()
+        if size != self.layout_size:
+            self.layout(*size)
+
+    def update(self):
+        """
+        Advance the menu animation by one simulation step.
+        """
         # Animation: make both buttons bob together
         self.bob_frame += 0.25
         if self.bob_frame > 20:
             self.bob_frame = 0
 
+    def update_hud(self, keys_held, double_tapped_actions):
+        """
+        Show which keys each hand is holding.
+
+        Args:
+            keys_held: Control.keys_held ([left action, held], [right action, held])
+            double_tapped_actions: Actions that were double tapped
+        """
+        left_action = keys_held[0][0]
+        right_action = keys_held[1][0]
+        self.left_hand.set_state(left_action, left_action in double_tapped_actions)
+        self.right_hand.set_state(right_action, right_action in double_tapped_actions)
+
+    def draw_menu(self):
+        """
+        Draws the play button and the settings button underneath, bobbing together.
+        """
+        self.check_layout()
+
         #Bob offset is 5 pixels up and 5 pixels down every 10 frames
         bob_offset = 5 if self.bob_frame > 10 else -5
 
-        # Centered horizontally
-        button_x = horizontal_center - scaled_button_width // 2 + horizontal_offset
+        play_button_y = self.menu_y + bob_offset
+        self.play_button.move_to(self.menu_x, play_button_y)
+        self.settings_button.move_to(self.menu_x, play_button_y + self.play_button.rect.height + self.vertical_spacing)
 
-        # Center both buttons vertically and space them apart
-        total_height = (scaled_button_height * 2) + vertical_spacing
-        center_y = height // 2
+        self.draw_widgets(self.menu_widgets)
 
-        #Position the buttons vertically with the bobbing effect
-        play_button_y = center_y - total_height // 2 + bob_offset
-        settings_button_y = play_button_y + scaled_button_height + vertical_spacing
-        
-        #Scale the icons according to the button height (because the icons are 1:1 ratio)
-        #Icons are also slightly scaled down to fit inside button better
-        play_button_icon = pygame.transform.scale(play_button_icon, (button_height * button_scale * 0.9, button_height * button_scale * 0.9))
-        settings_button_icon = pygame.transform.scale(settings_button_icon, (button_height * button_scale * 0.9, button_height * button_scale * 0.9))
-        
-        #Position the icons in the center of the buttons horizontally (after scaling)
-        play_button_icon_x = button_x + scaled_button_height // 2
-        settings_button_icon_x = button_x + scaled_button_height // 2
-        
-        #Position the icons vertically in the center of the buttons
-        play_button_icon_y = play_button_y + scaled_button_height // 2
-        settings_button_icon_y = settings_button_y + scaled_button_height // 2
-        
-        #Draw the buttons
-        self.display.screen.blit(play_button, (button_x, play_button_y))
-        self.display.screen.blit(settings_button, (button_x, settings_button_y))
-
-        # Draw the play icon
-        self.display.screen.blit(
-            play_button_icon,
-            (play_button_icon_x, play_button_y + scaled_button_height // 2 - play_button_icon.get_height() // 2)
-        )
-
-        # Draw the settings icon
-        self.display.screen.blit(
-            settings_button_icon,
-            (settings_button_icon_x, settings_button_y + scaled_button_height // 2 - settings_button_icon.get_height() // 2)
-        )
-        
-        
-    def draw_progress_bar(self):
+    def draw_hud(self):
         """
-        Draw the progress bar.
+        Draw the progress bar, score and hand indicators.
         """
-        pass
\ No newline at end of file
+        self.check_layout()
+
+        # Score is right aligned, so its position depends on the text width
+        right, top = self.score_layout
+        self.score_label.move_to(right - self.score_label.rect.width, top)
+
+        self.draw_widgets(self.hud_widgets)
+
+    def draw_widgets(self, widgets):
+        screen = self.display.screen
+        for widget in widgets:
+            widget.draw(screen)